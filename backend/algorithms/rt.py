@@ -20,7 +20,80 @@ import torch
 import numpy as np
 import time
 import math
+import threading
+import zlib
+from collections import OrderedDict
 from backend.algorithms.utils import randomized_neural_networks
+from backend.algorithms.utils.reservoir_numpy import Reservoir2Numpy
+
+# Maximum number of (paths, date) basis matrices kept by RT's basis cache
+BASIS_CACHE_SIZE = 64
+
+# Guards every RT basis cache (gunicorn serves requests from several threads)
+_BASIS_CACHE_LOCK = threading.Lock()
+
+# Paths per reservoir call when predicting continuation values in price(),
+# so the (nb_paths, hidden_size) basis is never built for every path at once
+PREDICT_BATCH_SIZE = 1_000_000
+
+
+def _backward_induction_kernel(payoffs, basis_all, coef_w, coef_b, active_dates, disc_factor):
+    """
+    Run the exercise recurrence of backward induction on precomputed inputs.
+
+    With a fixed policy the continuation value at a date only depends on the
+    state at that date, so all regression work happens before this function
+    and the loop itself is a handful of vector operations per date.
+
+    Args:
+        payoffs: (nb_paths, nb_dates+1) - Immediate exercise value at each date
+        basis_all: (nb_active, nb_paths, hidden_size) - Basis functions per active date
+        coef_w: (nb_active, hidden_size) - Regression weights per active date
+        coef_b: (nb_active,) - Regression intercept per active date
+        active_dates: Dates with learned coefficients, in descending order
+        disc_factor: One-period discount factor
+
+    Returns:
+        values: (nb_paths,) - Continuation value discounted to time 0
+        exercise_dates: (nb_paths,) - Time step when each path is exercised
+    """
+    nb_paths, nb_dates_plus_1 = payoffs.shape
+    nb_dates = nb_dates_plus_1 - 1
+
+    # Initialize with terminal payoff
+    values = payoffs[:, -1].copy()
+
+    # Track exercise dates (initialize to maturity = nb_dates)
+    exercise_dates = np.full(nb_paths, nb_dates, dtype=int)
+
+    # Work vectors reused across dates
+    continuation_values = np.empty(nb_paths, dtype=basis_all.dtype)
+    exercise_now = np.empty(nb_paths, dtype=bool)
+
+    prev_date = nb_dates
+    for i, date in enumerate(active_dates):
+        immediate_exercise = payoffs[:, date]
+
+        # Continuation values, clipped to non-negative (American option value can't be negative)
+        np.dot(basis_all[i], coef_w[i], out=continuation_values)
+        continuation_values += coef_b[i]
+        np.maximum(continuation_values, 0, out=continuation_values)
+
+        # Exercise if immediate > continuation, otherwise carry the future value
+        # discounted over all periods since the previous decision date
+        np.greater(immediate_exercise, continuation_values, out=exercise_now)
+        # (in place: values is a private copy of the terminal payoffs)
+        values *= disc_factor ** (prev_date - date)
+        np.copyto(values, immediate_exercise, where=exercise_now)
+
+        # Track exercise dates - only update if exercising earlier
+        np.copyto(exercise_dates, date, where=exercise_now)
+        prev_date = date
+
+    # Discount from the earliest decision date back to time 0
+    values *= disc_factor ** prev_date
+
+    return values, exercise_dates
 
 
 class RT:
@@ -85,6 +158,208 @@ class RT:
         # Storage for learned policy (coefficients at each time step)
         self._learned_coefficients = {}  # {time_step: coefficients}
 
+        # Reservoir basis memoized across inference calls on the same paths
+        self._basis_cache = OrderedDict()
+
+        # Per-thread scratch arrays reused by backward_induction_on_paths
+        self._scratch = threading.local()
+
+    def __getstate__(self):
+        """Drop inference caches when pickling (they are rebuilt on demand)."""
+        state = self.__dict__.copy()
+        state.pop('_basis_cache', None)
+        state.pop('_coef_w', None)
+        state.pop('_coef_b', None)
+        state.pop('_active_dates_desc', None)
+        state.pop('_scratch', None)
+        return state
+
+    # Plain configuration attributes written by to_inference_state()
+    _INFERENCE_CONFIG_KEYS = (
+        'hidden_size', 'factors', 'train_ITM_only', 'use_payoff_as_input',
+        'use_barrier_as_input', 'activation', 'dropout', 'use_var',
+        'is_path_dependent', 'barrier_values', 'nb_barriers', 'nb_base_fcts',
+    )
+
+    def to_inference_state(self):
+        """
+        Export what backward_induction_on_paths needs as plain data.
+
+        Returns:
+            config: dict of JSON-serializable settings (incl. reservoir activation/scale)
+            arrays: dict of NumPy arrays (reservoir weights, learned coefficients)
+        """
+        config = {key: getattr(self, key) for key in self._INFERENCE_CONFIG_KEYS}
+        config['factors'] = list(config['factors'])
+        config['barrier_values'] = [float(b) for b in config['barrier_values']]
+
+        reservoir = self._get_reservoir_numpy().to_dict()
+        config['reservoir'] = {
+            'activation': reservoir['activation'],
+            'scale': reservoir['scale'],
+            'negative_slope': reservoir['negative_slope'],
+            'num_layers': len(reservoir['weights']),
+        }
+
+        arrays = {}
+        for i, (weight, bias) in enumerate(zip(reservoir['weights'], reservoir['biases'])):
+            arrays[f'reservoir.weight_{i}'] = weight
+            arrays[f'reservoir.bias_{i}'] = bias
+        for date, coefficients in self._learned_coefficients.items():
+            arrays[f'coefficients.{date}'] = np.asarray(coefficients)
+        return config, arrays
+
+    @classmethod
+    def from_inference_state(cls, model, payoff, config, arrays):
+        """
+        Rebuild an inference-only RT from to_inference_state() output.
+
+        The PyTorch reservoir is not recreated, so the result supports
+        backward_induction_on_paths / predict_exercise_decisions but not
+        training (price) or forward simulation (predict).
+        """
+        rt = cls.__new__(cls)
+        rt.model = model
+        rt.payoff = payoff
+        for key in cls._INFERENCE_CONFIG_KEYS:
+            setattr(rt, key, config[key])
+        rt.factors = tuple(rt.factors)
+        rt.reservoir = None
+
+        reservoir = config['reservoir']
+        weights = [(arrays[f'reservoir.weight_{i}'], arrays[f'reservoir.bias_{i}'])
+                   for i in range(reservoir['num_layers'])]
+        rt._reservoir_numpy = Reservoir2Numpy(weights, activation=reservoir['activation'],
+                                              scale=reservoir['scale'],
+                                              negative_slope=reservoir['negative_slope'])
+
+        prefix = 'coefficients.'
+        rt._learned_coefficients = {int(key[len(prefix):]): arrays[key]
+                                    for key in arrays if key.startswith(prefix)}
+        rt._basis_cache = OrderedDict()
+        rt._scratch = threading.local()
+        return rt
+
+    def invalidate_cache(self):
+        """
+        Clear the memoized reservoir basis.
+        """
+        with _BASIS_CACHE_LOCK:
+            self._basis_cache = OrderedDict()
+
+    # Attributes set by price() that inference never reads
+    _TRAINING_ATTRS = ('_exercise_dates', 'split')
+
+    def strip_training_state(self):
+        """
+        Drop training-only state before saving a trained model.
+
+        Removes the per-path exercise dates and train/eval split from price()
+        and clears the inference caches. Call get_exercise_time() first if
+        it is needed, since it reads the removed attributes.
+
+        Returns:
+            List of the attribute names that were removed
+        """
+        removed = [name for name in self._TRAINING_ATTRS if hasattr(self, name)]
+        for name in removed:
+            delattr(self, name)
+        self.invalidate_cache()
+        self._coef_w = self._coef_b = self._active_dates_desc = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        return removed
+
+    def _inference_coefficients(self):
+        """
+        Prepare learned coefficients for inference.
+
+        The last coefficient multiplies the constant basis function, so it is
+        split off as an intercept: basis @ w + b avoids appending a column of
+        ones to every basis matrix.
+
+        Returns:
+            (active_dates, coef_w, coef_b): dates with coefficients in descending
+            order, {date: float32 weights}, {date: float intercept}
+        """
+        if getattr(self, '_coef_w', None) is None:
+            self._active_dates_desc = sorted(
+                (d for d in self._learned_coefficients if 0 < d < self.model.nb_dates),
+                reverse=True,
+            )
+            self._coef_w = {date: np.asarray(c[:-1], dtype=np.float32)
+                            for date, c in self._learned_coefficients.items()}
+            self._coef_b = {date: float(c[-1]) for date, c in self._learned_coefficients.items()}
+        return self._active_dates_desc, self._coef_w, self._coef_b
+
+    def _scratch_buffers(self, nb_paths, nb_dates, state_size):
+        """
+        Scratch arrays for backward_induction_on_paths, reused across calls.
+
+        Buffers are thread-local (the API may serve requests concurrently) and
+        reallocated when the shapes change. Nothing returned to the caller may
+        alias them.
+
+        Returns:
+            dict with 'payoffs' (nb_paths, nb_dates+1), 'basis' (nb_dates, nb_paths, hidden)
+            and 'states' (nb_dates, nb_paths, state_size), all float32
+        """
+        local = getattr(self, '_scratch', None)
+        if local is None:
+            local = self._scratch = threading.local()
+
+        key = (nb_paths, nb_dates, state_size)
+        if getattr(local, 'key', None) != key:
+            local.key = key
+            local.buffers = {
+                'payoffs': np.empty((nb_paths, nb_dates + 1), dtype=np.float32),
+                'basis': np.empty((nb_dates, nb_paths, self.nb_base_fcts - 1), dtype=np.float32),
+                'states': np.empty((nb_dates, nb_paths, state_size), dtype=np.float32),
+            }
+        return local.buffers
+
+    def _cached_basis(self, stock_paths, var_paths, dates, compute, out):
+        """
+        Fill out[i] with the reservoir basis for (stock_paths, dates[i]).
+
+        Cache misses are collected and passed to compute(missing_dates) in a
+        single call, which returns their stacked basis.
+
+        Entries are keyed by the paths' buffer address, layout and a CRC32 of
+        their contents, so a reused address or a buffer overwritten in place
+        misses instead of returning a stale basis. Each entry owns a copy of
+        its basis and nothing else. LRU-bounded to BASIS_CACHE_SIZE.
+        """
+        path_key = (stock_paths.ctypes.data, stock_paths.shape, zlib.crc32(stock_paths))
+        if var_paths is not None:
+            path_key += (var_paths.ctypes.data, var_paths.shape, zlib.crc32(var_paths))
+
+        missing = []
+        with _BASIS_CACHE_LOCK:
+            cache = getattr(self, '_basis_cache', None)
+            if cache is None:
+                cache = self._basis_cache = OrderedDict()
+            for i, date in enumerate(dates):
+                entry = cache.get(path_key + (date,))
+                if entry is not None:
+                    cache.move_to_end(path_key + (date,))
+                    out[i] = entry
+                else:
+                    missing.append(i)
+
+        if missing:
+            # Reservoir evaluation runs outside the lock
+            basis = compute([dates[i] for i in missing])
+            for k, i in enumerate(missing):
+                out[i] = basis[k]
+            with _BASIS_CACHE_LOCK:
+                cache = self._basis_cache
+                for k, i in enumerate(missing):
+                    cache[path_key + (dates[i],)] = basis[k].copy()
+                while len(cache) > BASIS_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return out
+
     def _init_reservoir(self, state_size, hidden_size, factors, activation, dropout):
         """Initialize randomized neural network (reservoir)."""
         # RT uses single layer (num_layers=1 fixed, like RLSM)
@@ -98,6 +373,81 @@ class RT:
         )
         self.nb_base_fcts = hidden_size + 1  # +1 for constant term
 
+    def _reservoir_basis(self, X):
+        """
+        Evaluate the PyTorch reservoir on X and return the features as NumPy.
+
+        The input is moved to whichever device holds the reservoir, so training
+        runs on the GPU after rt.reservoir.to('cuda') with no other change.
+        """
+        device = next(self.reservoir.parameters()).device
+        # The reservoir is frozen, so skip autograd's version-counter bookkeeping
+        with torch.inference_mode():
+            X_tensor = torch.from_numpy(X).type(torch.float32).to(device)
+            return self.reservoir(X_tensor).cpu().numpy()
+
+    def _get_reservoir_numpy(self):
+        """
+        Return a NumPy copy of the (frozen) reservoir for fast inference.
+
+        Built lazily so that models pickled before it existed still work.
+        """
+        if getattr(self, '_reservoir_numpy', None) is None:
+            self._reservoir_numpy = Reservoir2Numpy.from_pytorch_reservoir(self.reservoir)
+        return self._reservoir_numpy
+
+    def _barrier_block(self, strike, nb_paths):
+        """
+        Barrier input hint columns (barrier / strike), identical for every date.
+
+        Args:
+            strike: Strike used for normalization (scalar or per-stock array)
+            nb_paths: Number of rows
+
+        Returns:
+            (nb_paths, nb_barriers) read-only broadcast view, or None if disabled
+        """
+        if self.nb_barriers == 0:
+            return None
+        strike_scalar = strike[0] if isinstance(strike, np.ndarray) else strike
+        barrier_row = np.asarray([b / strike_scalar for b in self.barrier_values], dtype=np.float32)
+        return np.broadcast_to(barrier_row, (nb_paths, self.nb_barriers))
+
+    def _new_state_buffer(self, stock_paths, var_paths, strike):
+        """
+        Allocate the (nb_paths, state_size) float32 regression state used in training.
+
+        Column layout matches the reservoir input: stocks / strike, payoff (when
+        use_payoff_as_input), variance, barrier / strike.
+        The date-invariant barrier columns are filled here.
+        """
+        nb_paths = stock_paths.shape[0]
+        nb_rows = self.model.nb_stocks + self.use_payoff_as_input
+        nb_var = var_paths.shape[1] if self.use_var and var_paths is not None else 0
+        state_buf = np.empty((nb_paths, nb_rows + nb_var + self.nb_barriers), dtype=np.float32)
+        barrier_block = self._barrier_block(strike, nb_paths)
+        if barrier_block is not None:
+            state_buf[:, nb_rows + nb_var:] = barrier_block
+        return state_buf
+
+    def _fill_state(self, state_buf, stock_paths, var_paths, strike, date, payoff=None):
+        """
+        Write the regression state at date into state_buf (see _new_state_buffer) and return it.
+
+        payoff is the (nb_paths,) payoff at date, required when use_payoff_as_input.
+        It is read per date so stock_paths (possibly a memmap) is never copied whole.
+        """
+        nb_stocks = self.model.nb_stocks
+        nb_rows = nb_stocks + self.use_payoff_as_input
+        np.divide(stock_paths[:, :nb_stocks, date], strike,
+                  out=state_buf[:, :nb_stocks], casting='same_kind')
+        # Payoff column is kept unnormalized
+        if self.use_payoff_as_input:
+            state_buf[:, nb_stocks] = payoff
+        if self.use_var and var_paths is not None:
+            state_buf[:, nb_rows:nb_rows + var_paths.shape[1]] = var_paths[:, :, date]
+        return state_buf
+
     def _eval_payoff(self, stock_paths, date=None):
         """
         Evaluate payoff at a specific date, handling both path-dependent and non-path-dependent.
@@ -126,6 +476,23 @@ class RT:
                 # Current time step
                 return self.payoff.eval(stock_paths[:, :self.model.nb_stocks, date])
 
+    def _eval_payoff_dates(self, stock_paths, by_date=True):
+        """
+        Evaluate the payoff at every date in one call.
+
+        Args:
+            stock_paths: Full stock paths array (nb_paths, nb_stocks, nb_dates+1)
+            by_date: Return one contiguous row per date (the layout the backward
+                induction in price() reads); False keeps eval_timeline's
+                (nb_paths, nb_dates+1) layout without a transposed copy
+
+        Returns:
+            payoffs: (nb_dates+1, nb_paths) array, row t equal to _eval_payoff(stock_paths, date=t)
+                (its (nb_paths, nb_dates+1) transpose when by_date is False)
+        """
+        timeline = self.payoff.eval_timeline(stock_paths[:, :self.model.nb_stocks, :])
+        return np.ascontiguousarray(timeline.T) if by_date else timeline
+
     def price(self, train_eval_split=2, stock_paths=None):
         """
         Compute option price using backward induction with RT.
@@ -153,24 +520,13 @@ class RT:
         time_path_gen = time.time() - t_start
         print(f"time path gen: {time_path_gen:.4f} ", end="")
 
-        # Compute payoffs for all paths (for use_payoff_as_input feature)
-        if self.use_payoff_as_input:
-            # Compute payoffs at all time steps
-            nb_paths, nb_stocks, nb_dates_plus_1 = stock_paths.shape
-            payoffs = np.zeros((nb_paths, nb_dates_plus_1), dtype=np.float32)
-
-            for t in range(nb_dates_plus_1):
-                payoffs[:, t] = self._eval_payoff(stock_paths, date=t)
-
-            # Add payoff as extra feature
-            stock_paths = np.concatenate(
-                [stock_paths, np.expand_dims(payoffs, axis=1)], axis=1
-            )
+        # Payoffs at all time steps, evaluated once with running extrema
+        payoffs_by_date = self._eval_payoff_dates(stock_paths)
 
         # Split into training and evaluation sets
         self.split = len(stock_paths) // train_eval_split
 
-        nb_paths, nb_stocks_plus, nb_dates_from_shape = stock_paths.shape
+        nb_paths = stock_paths.shape[0]
         # Use model's nb_dates (actual time steps) for consistency across all algorithms
         disc_factor = math.exp(-self.model.rate * self.model.maturity / self.model.nb_dates)
 
@@ -183,36 +539,27 @@ class RT:
             strike = np.full(self.model.nb_stocks, strike, dtype=np.float32)
 
         # Initialize with terminal payoff
-        values = self._eval_payoff(stock_paths, date=None)
+        values = payoffs_by_date[-1].copy()
 
         # Track exercise dates (initialize to maturity = nb_dates, not nb_dates-1)
         self._exercise_dates = np.full(nb_paths, self.model.nb_dates, dtype=int)
 
         # Clear previous learned policy and prepare to store new one
         self._learned_coefficients = {}
+        self._coef_w = self._coef_b = self._active_dates_desc = None
+
+        # Regression state buffer, refilled in place at each date; the barrier
+        # input hint is the same for every date, so write it once
+        state_buf = self._new_state_buffer(stock_paths, var_paths, strike)
 
         # Backward induction from T-1 to 1
         for date in range(self.model.nb_dates - 1, 0, -1):
             # Current immediate exercise value
-            immediate_exercise = self._eval_payoff(stock_paths, date=date)
+            immediate_exercise = payoffs_by_date[date]
 
             # Prepare state for regression (normalize stock prices by strike)
-            if self.use_payoff_as_input:
-                # Normalize only the stock price columns, keep payoff unnormalized
-                normalized_stocks = stock_paths[:, :self.model.nb_stocks, date] / strike
-                current_state = np.concatenate([normalized_stocks, stock_paths[:, self.model.nb_stocks:, date]], axis=1)
-            else:
-                current_state = stock_paths[:, :self.model.nb_stocks, date] / strike
-
-            if self.use_var and var_paths is not None:
-                current_state = np.concatenate([current_state, var_paths[:, :, date]], axis=1)
-
-            # Add barrier values as input hint (if enabled)
-            if self.nb_barriers > 0:
-                strike_scalar = strike[0] if isinstance(strike, np.ndarray) else strike
-                barrier_features = np.array([[b / strike_scalar for b in self.barrier_values]], dtype=np.float32)
-                barrier_features = np.repeat(barrier_features, current_state.shape[0], axis=0)
-                current_state = np.concatenate([current_state, barrier_features], axis=1)
+            current_state = self._fill_state(state_buf, stock_paths, var_paths, strike, date,
+                                             payoff=immediate_exercise)
 
             # Learn continuation value using randomized NN regression
             continuation_values, coefficients = self._learn_continuation(
@@ -234,7 +581,7 @@ class RT:
             values[~exercise_now] *= disc_factor
 
         # Final payoff at t=0
-        payoff_0 = self._eval_payoff(stock_paths, date=0)
+        payoff_0 = payoffs_by_date[0]
 
         # Return average price on evaluation set, discounted to time 0
         return max(payoff_0[0], np.mean(values[self.split:]) * disc_factor), time_path_gen
@@ -265,24 +612,13 @@ class RT:
         time_path_gen = time.time() - t_start
         print(f"time path gen: {time_path_gen:.4f} ", end="")
 
-        # Compute payoffs for all paths (for use_payoff_as_input feature)
-        if self.use_payoff_as_input:
-            # Compute payoffs at all time steps
-            nb_paths, nb_stocks, nb_dates_plus_1 = stock_paths.shape
-            payoffs = np.zeros((nb_paths, nb_dates_plus_1), dtype=np.float32)
-
-            for t in range(nb_dates_plus_1):
-                payoffs[:, t] = self._eval_payoff(stock_paths, date=t)
-
-            # Add payoff as extra feature
-            stock_paths = np.concatenate(
-                [stock_paths, np.expand_dims(payoffs, axis=1)], axis=1
-            )
+        # Payoffs at all time steps, evaluated once with running extrema
+        payoffs_by_date = self._eval_payoff_dates(stock_paths)
 
         # Split into training and evaluation sets
         self.split = len(stock_paths) // train_eval_split
 
-        nb_paths, nb_stocks_plus, nb_dates_from_shape = stock_paths.shape
+        nb_paths = stock_paths.shape[0]
         disc_factor = math.exp(-self.model.rate * self.model.maturity / self.model.nb_dates)
 
         # Get strike price for normalization
@@ -294,7 +630,7 @@ class RT:
             strike = np.full(self.model.nb_stocks, strike, dtype=np.float32)
 
         # Initialize with terminal payoff
-        values = self._eval_payoff(stock_paths, date=None)
+        values = payoffs_by_date[-1].copy()
 
         # Initialize martingale M for upper bound (starts at terminal payoff)
         M = np.zeros((nb_paths, self.model.nb_dates + 1), dtype=np.float32)
@@ -302,32 +638,23 @@ class RT:
 
         # Clear previous learned policy
         self._learned_coefficients = {}
+        self._coef_w = self._coef_b = self._active_dates_desc = None
 
         # Initialize exercise dates tracking (for get_exercise_time)
         self._exercise_dates = np.full(nb_paths, self.model.nb_dates, dtype=int)
 
+        # Regression state buffer, refilled in place at each date; the barrier
+        # input hint is the same for every date, so write it once
+        state_buf = self._new_state_buffer(stock_paths, var_paths, strike)
+
         # Backward induction from T-1 to 1
         for date in range(self.model.nb_dates - 1, 0, -1):
             # Current immediate exercise value
-            immediate_exercise = self._eval_payoff(stock_paths, date=date)
+            immediate_exercise = payoffs_by_date[date]
 
             # Prepare state for regression (normalize stock prices by strike)
-            if self.use_payoff_as_input:
-                # Normalize only the stock price columns, keep payoff unnormalized
-                normalized_stocks = stock_paths[:, :self.model.nb_stocks, date] / strike
-                current_state = np.concatenate([normalized_stocks, stock_paths[:, self.model.nb_stocks:, date]], axis=1)
-            else:
-                current_state = stock_paths[:, :self.model.nb_stocks, date] / strike
-
-            if self.use_var and var_paths is not None:
-                current_state = np.concatenate([current_state, var_paths[:, :, date]], axis=1)
-
-            # Add barrier values as input hint (if enabled)
-            if self.nb_barriers > 0:
-                strike_scalar = strike[0] if isinstance(strike, np.ndarray) else strike
-                barrier_features = np.array([[b / strike_scalar for b in self.barrier_values]], dtype=np.float32)
-                barrier_features = np.repeat(barrier_features, current_state.shape[0], axis=0)
-                current_state = np.concatenate([current_state, barrier_features], axis=1)
+            current_state = self._fill_state(state_buf, stock_paths, var_paths, strike, date,
+                                             payoff=immediate_exercise)
 
             # Learn continuation value using randomized NN regression
             continuation_values, coefficients = self._learn_continuation(
@@ -352,7 +679,7 @@ class RT:
             M[:, date] = np.maximum(immediate_exercise, continuation_values)
 
         # Compute lower bound (regular pricing on evaluation set)
-        payoff_0 = self._eval_payoff(stock_paths, date=0)
+        payoff_0 = payoffs_by_date[0]
         lower_bound = max(payoff_0[0], np.mean(values[self.split:]) * disc_factor)
 
         # Set M[0] based on time-0 payoff and discounted continuation value
@@ -407,9 +734,7 @@ class RT:
 
         if len(in_the_money) > 0:
             # Evaluate basis functions for training ITM paths
-            X_train = current_state[in_the_money]
-            X_tensor_train = torch.from_numpy(X_train).type(torch.float32)
-            basis_train = self.reservoir(X_tensor_train).detach().numpy()
+            basis_train = self._reservoir_basis(current_state[in_the_money])
             # Add constant term (intercept)
             basis_train = np.concatenate([basis_train, np.ones((len(basis_train), 1), dtype=np.float32)], axis=1)
 
@@ -420,15 +745,13 @@ class RT:
                 rcond=None
             )[0]
 
-            # Evaluate basis functions for all ITM paths (for prediction)
-            X_all = current_state[in_the_money_all]
-            X_tensor_all = torch.from_numpy(X_all).type(torch.float32)
-            basis_all = self.reservoir(X_tensor_all).detach().numpy()
-            # Add constant term (intercept)
-            basis_all = np.concatenate([basis_all, np.ones((len(basis_all), 1), dtype=np.float32)], axis=1)
-
-            # Predict continuation values for all ITM paths
-            continuation_values[in_the_money_all] = np.dot(basis_all, coefficients)
+            # Predict continuation values for all ITM paths, one batch at a time
+            for start in range(0, len(in_the_money_all), PREDICT_BATCH_SIZE):
+                batch = in_the_money_all[start:start + PREDICT_BATCH_SIZE]
+                basis_batch = self._reservoir_basis(current_state[batch])
+                # Add constant term (intercept)
+                basis_batch = np.concatenate([basis_batch, np.ones((len(basis_batch), 1), dtype=np.float32)], axis=1)
+                continuation_values[batch] = np.dot(basis_batch, coefficients)
 
             # Clip to non-negative (American option value can't be negative)
             continuation_values = np.maximum(0, continuation_values)
@@ -498,8 +821,7 @@ class RT:
             coefficients = self._learned_coefficients[date]
 
             # Evaluate basis functions using reservoir
-            X_tensor = torch.from_numpy(current_state).type(torch.float32)
-            basis = self.reservoir(X_tensor).detach().numpy()
+            basis = self._reservoir_basis(current_state)
             basis = np.concatenate([basis, np.ones((len(basis), 1), dtype=np.float32)], axis=1)
 
             continuation_values = np.dot(basis, coefficients)
@@ -541,6 +863,14 @@ class RT:
         if not self._learned_coefficients:
             raise ValueError("No learned policy available. Must call price() first to train.")
 
+        # Cast once so the reservoir never has to copy its input (no-op for float32 paths).
+        # Only caller-owned arrays are worth caching: a converted copy is new every call
+        original_paths, original_var = stock_paths, var_paths
+        stock_paths = np.ascontiguousarray(stock_paths, dtype=np.float32)
+        if var_paths is not None:
+            var_paths = np.ascontiguousarray(var_paths, dtype=np.float32)
+        cacheable = stock_paths is original_paths and var_paths is original_var
+
         nb_paths = stock_paths.shape[0]
         nb_dates = self.model.nb_dates
 
@@ -551,74 +881,79 @@ class RT:
             strike = self.model.spot if hasattr(self.model, 'spot') else stock_paths[0, :self.model.nb_stocks, 0]
         if np.isscalar(strike):
             strike = np.full(self.model.nb_stocks, strike, dtype=np.float32)
+        else:
+            strike = np.asarray(strike, dtype=np.float32)
 
-        # Compute all payoffs upfront
-        payoffs = np.zeros((nb_paths, nb_dates + 1), dtype=np.float32)
-        for t in range(nb_dates + 1):
-            payoffs[:, t] = self._eval_payoff(stock_paths, date=t)
-
-        # Initialize with terminal payoff
-        values = payoffs[:, -1].copy()
-
-        # Track exercise dates (initialize to maturity = nb_dates)
-        exercise_dates = np.full(nb_paths, nb_dates, dtype=int)
-
-        disc_factor = math.exp(-self.model.rate * self.model.maturity / nb_dates)
-
-        # Backward induction from T-1 to 1 (same as in price())
-        for date in range(nb_dates - 1, 0, -1):
-            # Skip if no coefficients learned for this time step
-            if date not in self._learned_coefficients:
-                continue
-
-            # Current immediate exercise value
-            immediate_exercise = payoffs[:, date]
-
-            # Prepare state (normalize stock prices by strike)
-            current_state = stock_paths[:, :self.model.nb_stocks, date] / strike
+        # Reservoir input width and reusable scratch arrays for this problem size
+        nb_stocks = self.model.nb_stocks
+        use_var = self.use_var and var_paths is not None
+        nb_var = var_paths.shape[1] if use_var else 0
+        state_size = nb_stocks + self.use_payoff_as_input + nb_var + self.nb_barriers
+        scratch = self._scratch_buffers(nb_paths, nb_dates, state_size)
 
+        # Compute all payoffs upfront
+        if not self.is_path_dependent:
+            # Path-independent payoff: evaluate every (path, date) pair in a single batched call
+            flat = stock_paths[:, :nb_stocks, :].transpose(0, 2, 1).reshape(-1, nb_stocks)
+            payoffs = self.payoff.eval(flat).reshape(nb_paths, nb_dates + 1).astype(np.float32, copy=False)
+        else:
+            # Path-dependent payoff: all dates at once from running extrema
+            payoffs = scratch['payoffs']
+            payoffs[:] = self._eval_payoff_dates(stock_paths, by_date=False)
+
+        # Evaluate the regression basis for every date with learned coefficients
+        active_dates, coef_w, coef_b = self._inference_coefficients()
+        nb_active = len(active_dates)
+        basis_all = scratch['basis'][:nb_active]
+        coef_w_stack = np.empty((nb_active, self.nb_base_fcts - 1), dtype=np.float32)
+        coef_b_stack = np.empty(nb_active, dtype=np.float32)
+        reservoir_np = self._get_reservoir_numpy()
+
+        # Barrier input hint is the same for every date, build it once
+        barrier_block = self._barrier_block(strike, nb_paths)
+
+        def compute_basis(dates):
+            # Stack the states of all requested dates (same feature order as in price())
+            # and run the reservoir once on (len(dates) * nb_paths, state_size)
+            states = scratch['states'][:len(dates)]
+            np.divide(stock_paths[:, :nb_stocks, dates].transpose(2, 0, 1), strike,
+                      out=states[:, :, :nb_stocks])
+            col = nb_stocks
             if self.use_payoff_as_input:
-                current_state = np.concatenate([current_state, payoffs[:, date:date+1]], axis=1)
-
-            if self.use_var and var_paths is not None:
-                current_state = np.concatenate([current_state, var_paths[:, :, date]], axis=1)
-
-            # Get learned coefficients for this time step
-            coefficients = self._learned_coefficients[date]
+                states[:, :, col] = payoffs[:, dates].T
+                col += 1
+            if use_var:
+                states[:, :, col:col + nb_var] = var_paths[:, :, dates].transpose(2, 0, 1)
+                col += nb_var
+            if barrier_block is not None:
+                states[:, :, col:] = barrier_block
 
             # Evaluate basis functions using reservoir
-            X_tensor = torch.from_numpy(current_state).type(torch.float32)
-            basis = self.reservoir(X_tensor).detach().numpy()
-            basis = np.concatenate([basis, np.ones((len(basis), 1), dtype=np.float32)], axis=1)
-
-            # Compute continuation values
-            continuation_values = np.dot(basis, coefficients)
-
-            # Clip to non-negative (American option value can't be negative)
-            continuation_values = np.maximum(0, continuation_values)
+            basis = reservoir_np(states.reshape(-1, state_size))
+            return basis.reshape(len(dates), nb_paths, -1)
 
-            # Discount future values
-            discounted_values = values * disc_factor
-
-            # Exercise decision: exercise if immediate > continuation
-            exercise_now = immediate_exercise > continuation_values
-
-            # Update values
-            values = np.where(exercise_now, immediate_exercise, discounted_values)
+        if cacheable:
+            self._cached_basis(stock_paths, var_paths, active_dates, compute_basis, out=basis_all)
+        else:
+            basis_all[:] = compute_basis(active_dates)
+        for i, date in enumerate(active_dates):
+            coef_w_stack[i] = coef_w[date]
+            coef_b_stack[i] = coef_b[date]
 
-            # Track exercise dates - only update if exercising earlier
-            exercise_dates[exercise_now] = date
+        disc_factor = math.exp(-self.model.rate * self.model.maturity / nb_dates)
 
-        # After loop, values represent value at time 1
-        # Apply extra discount to get value at time 0
-        discounted_continuation = values * disc_factor
+        # Backward induction from T-1 to 1 (same as in price()); dates without
+        # coefficients are skipped and their discounting is compounded
+        discounted_continuation, exercise_dates = _backward_induction_kernel(
+            payoffs, basis_all, coef_w_stack, coef_b_stack, active_dates, disc_factor
+        )
 
         # Check if immediate exercise at time 0 is better than continuation
-        payoff_0 = self._eval_payoff(stock_paths, date=0)
+        payoff_0 = payoffs[:, 0]
         final_values = np.maximum(payoff_0, discounted_continuation)
 
         # Extract payoff values at exercise time
-        payoff_values = np.array([payoffs[i, exercise_dates[i]] for i in range(nb_paths)])
+        payoff_values = payoffs[np.arange(nb_paths), exercise_dates]
 
         # Compute price (average of final values)
         price = np.mean(final_values)
@@ -0,0 +1,232 @@
+"""
+NumPy implementation of the randomized neural network (reservoir) forward pass.
+
+The reservoir weights are random and frozen, so inference only needs the
+weight matrices and the activation function. Mirroring Reservoir2 in NumPy
+avoids the torch tensor round-trip and per-module dispatch on every call.
+"""
+
+import numpy as np
+
+# scipy.special.ndtr, imported on first GELU call so other activations never load scipy
+_ndtr = None
+
+
+def _get_ndtr():
+    """Return scipy.special.ndtr, importing scipy on first use."""
+    global _ndtr
+    if _ndtr is None:
+        from scipy.special import ndtr
+        _ndtr = ndtr
+    return _ndtr
+
+
+def _select_positive(x, negative, out):
+    """x where x > 0, else negative; written into out when given (out may be x)."""
+    if out is None:
+        return np.where(x > 0, x, negative)
+    if out is not x:
+        np.copyto(out, x)
+    np.copyto(out, negative, where=x <= 0)
+    return out
+
+
+def gelu(x, out=None):
+    """Exact GELU: x * Phi(x), with the normal CDF evaluated in one ufunc call."""
+    return np.multiply(x, _get_ndtr()(x), out=out)
+
+
+def leaky_relu(x, negative_slope=0.5, out=None):
+    """
+    Leaky ReLU with configurable negative slope.
+
+    For 0 <= negative_slope <= 1, max(x, slope * x) equals the piecewise
+    definition, so no boolean mask is materialized.
+    """
+    scaled = np.multiply(x, np.float32(negative_slope), dtype=x.dtype)
+    if 0 <= negative_slope <= 1:
+        return np.maximum(x, scaled, out=scaled if out is None else out)
+    return _select_positive(x, scaled, out)
+
+
+def relu(x, out=None):
+    """Rectified linear unit."""
+    return np.maximum(x, 0, out=out)
+
+
+def tanh(x, out=None):
+    """Hyperbolic tangent."""
+    return np.tanh(x, out=out)
+
+
+def elu(x, out=None):
+    """Exponential linear unit (alpha=1)."""
+    return _select_positive(x, np.expm1(x), out)
+
+
+def softplus(x, out=None):
+    """Softplus: log(1 + exp(x)), computed stably."""
+    return np.logaddexp(0, x, out=out)
+
+
+# Activation functions by name; each accepts out= so the forward pass can apply it in place
+ACTIVATIONS = {
+    'gelu': gelu,
+    'leakyrelu': leaky_relu,
+    'relu': relu,
+    'tanh': tanh,
+    'elu': elu,
+    'softplus': softplus,
+}
+
+
+def _quantize_int8(weights):
+    """
+    Quantize transposed (in, out) weights to int8 with a per-output-unit scale.
+
+    Returns:
+        (weights, scales): list of (int8 weight, float32 bias), list of float32 (out,) scales
+    """
+    quantized, scales = [], []
+    for w_t, b in weights:
+        s = np.abs(w_t).max(axis=0) / np.float32(127)
+        s[s == 0] = 1
+        quantized.append((np.round(w_t / s).astype(np.int8), b))
+        scales.append(s.astype(np.float32))
+    return quantized, scales
+
+
+class Reservoir2Numpy:
+    """
+    NumPy version of Reservoir2 for inference.
+
+    Architecture: Input * scale → [Linear → Activation] × num_layers → Output
+
+    Args:
+        weights: List of (weight, bias) pairs, weight of shape (out_features, in_features).
+            Weights are stored transposed, as contiguous (in_features, out_features).
+        activation: Activation name ('gelu', 'leakyrelu', 'relu', 'tanh', 'elu', 'softplus')
+        scale: Input scaling factor (factors[0] of the PyTorch reservoir)
+        negative_slope: Negative slope for 'leakyrelu'
+        quantize: Store weights as int8 with one float32 scale per output unit.
+            Off by default: the learned regression coefficients are large, so
+            the rounding error moves knife-edge exercise decisions.
+
+    Example:
+        >>> reservoir_np = Reservoir2Numpy.from_pytorch_reservoir(reservoir)
+        >>> features = reservoir_np(x)  # (batch_size, hidden_size) float32
+    """
+
+    def __init__(self, weights, activation='gelu', scale=1.0, negative_slope=0.5,
+                 quantize=False):
+        activation = activation.lower()
+        if activation not in ACTIVATIONS:
+            raise ValueError(
+                f"Invalid activation: {activation}. "
+                f"Must be one of: {list(ACTIVATIONS.keys())}"
+            )
+
+        self.weights = [
+            (np.ascontiguousarray(np.asarray(w, dtype=np.float32).T),
+             np.asarray(b, dtype=np.float32))
+            for w, b in weights
+        ]
+        self.quantize = bool(quantize)
+        self.weight_scales = None
+        if self.quantize:
+            self.weights, self.weight_scales = _quantize_int8(self.weights)
+        self.activation = activation
+        self.scale = float(scale)
+        self.negative_slope = float(negative_slope)
+        self.num_layers = len(self.weights)
+        self.hidden_size = self.weights[-1][0].shape[1]
+
+    @classmethod
+    def from_pytorch_reservoir(cls, reservoir, quantize=False):
+        """
+        Build a NumPy reservoir from a PyTorch Reservoir2.
+
+        Args:
+            reservoir: Reservoir2 instance
+            quantize: Store weights as int8 (see class docstring)
+
+        Returns:
+            Reservoir2Numpy with the same weights and activation
+        """
+        import torch
+
+        activation_names = {
+            torch.nn.GELU: 'gelu',
+            torch.nn.LeakyReLU: 'leakyrelu',
+            torch.nn.ReLU: 'relu',
+            torch.nn.Tanh: 'tanh',
+            torch.nn.ELU: 'elu',
+            torch.nn.Softplus: 'softplus',
+        }
+
+        weights = []
+        activation = None
+        negative_slope = 0.5
+        for module in reservoir.NN:
+            if isinstance(module, torch.nn.Linear):
+                weights.append((module.weight.detach().cpu().numpy(),
+                                module.bias.detach().cpu().numpy()))
+            elif type(module) in activation_names:
+                activation = activation_names[type(module)]
+                if isinstance(module, torch.nn.LeakyReLU):
+                    negative_slope = module.negative_slope
+            # Dropout is a no-op at inference time
+
+        if activation is None:
+            raise ValueError(f"Unsupported reservoir architecture: {reservoir.NN}")
+
+        return cls(weights, activation=activation, scale=reservoir.factors[0],
+                   negative_slope=negative_slope, quantize=quantize)
+
+    def to_dict(self):
+        """Serialize to a dict of plain Python values and NumPy arrays."""
+        return {
+            'weights': [w_t.T for w_t in self._float_weights()],
+            'biases': [b for _, b in self.weights],
+            'activation': self.activation,
+            'scale': self.scale,
+            'negative_slope': self.negative_slope,
+            'quantize': self.quantize,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a reservoir serialized with to_dict()."""
+        return cls(list(zip(data['weights'], data['biases'])),
+                   activation=data['activation'], scale=data['scale'],
+                   negative_slope=data['negative_slope'],
+                   quantize=data.get('quantize', False))
+
+    def _float_weights(self):
+        """Transposed weights as float32 (dequantized if stored as int8)."""
+        if self.weight_scales is None:
+            return [w_t for w_t, _ in self.weights]
+        return [w_t.astype(np.float32) * s for (w_t, _), s in zip(self.weights, self.weight_scales)]
+
+    def __call__(self, x):
+        """
+        Extract random features from input.
+
+        Args:
+            x: Array of shape (batch_size, state_size)
+
+        Returns:
+            Random features of shape (batch_size, hidden_size), float32
+        """
+        activate = ACTIVATIONS[self.activation]
+        act_kwargs = {'negative_slope': self.negative_slope} if self.activation == 'leakyrelu' else {}
+        out = np.asarray(x, dtype=np.float32) * np.float32(self.scale)
+        for i, (weight_t, bias) in enumerate(self.weights):
+            if self.weight_scales is None:
+                out = out @ weight_t
+            else:
+                out = out @ weight_t.astype(np.float32)
+                out *= self.weight_scales[i]
+            out += bias
+            activate(out, out=out, **act_kwargs)
+        return out
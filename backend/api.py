@@ -18,8 +18,18 @@ if PROJECT_ROOT not in sys.path:
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import numpy as np
+import orjson
+import hashlib
 import pickle
-import random
+import itertools
+import time
+import threading
+import gc
+import ctypes
+import ctypes.util
+from collections import OrderedDict
+
+from backend.model_io import load_model_npz
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
@@ -31,8 +41,11 @@ MODELS_DIR = os.path.join(DATA_DIR, 'trained_models')
 
 # Global storage for loaded data (lazy loaded on-demand)
 GAME_DATA = {}
-LOADED_MODELS_CACHE = {}  # Cache for loaded models (max 1 at a time to save memory)
+LOADED_MODELS_CACHE = OrderedDict()  # LRU cache for loaded models (max 1 at a time to save memory)
 MAX_CACHED_MODELS = 1
+PATHS_CACHE = {}  # {nb_stocks: test paths}, shared by all games with that stock count
+INFO_CACHE = {'key': None, 'body': None, 'etag': None}  # Serialized /api/game/info payload
+MODEL_LOAD_LOCK = threading.Lock()  # Serializes loads/evictions across gunicorn threads
 
 # Game configurations - ALL 9 GAMES with lazy loading
 # Only 1 model loaded in memory at a time to stay within 512MB
@@ -128,6 +141,23 @@ GAME_CONFIGS = [
     }
 ]
 
+# Moving barriers shown for stochastic-barrier games: (response key, B(0), step low, step high).
+# Drawn in this order from RandomState(42), matching the seeded barriers in the payoffs
+MOVING_BARRIER_SPECS = {
+    # StepBarrierCall: single upper barrier
+    'randomlymovingbarriercall': [
+        ('barrier_path_upper', 125, -2, 1),
+    ],
+    # DoubleStepBarrierDispersionCall: lower barrier drawn first, then upper
+    'doublemovingbarrierdispersioncall': [
+        ('barrier_path_lower', 85, -1, 2),
+        ('barrier_path_upper', 115, -2, 1),
+    ],
+}
+BARRIER_CACHE = {}  # {(game_id, nb_dates): {response key: barrier list}}
+MAX_BATCH_GAMES = 50  # Upper bound for /api/game/start?batch=k
+PATH_RNG = np.random.default_rng()  # Shuffles the order in which each worker serves test paths
+
 # Default game to pre-load at startup for instant first click
 DEFAULT_GAME = 'upandoutcall'  # Smallest model (13MB), Medium difficulty
 
@@ -161,16 +191,38 @@ def load_game_metadata():
     print(f"Loaded metadata for {len(GAME_DATA)} games")
 
 
+def load_test_paths(nb_stocks):
+    """
+    Load the test paths for a stock count.
+
+    Prefers the uncompressed test_{n}stock.npy, memory-mapped read-only so only
+    the pages actually touched are read in (and can be dropped again by the
+    OS). Falls back to the compressed .npz.
+    """
+    npy_file = os.path.join(PATHS_DIR, f'test_{nb_stocks}stock.npy')
+    if os.path.exists(npy_file):
+        return np.load(npy_file, mmap_mode='r')
+    return np.load(os.path.join(PATHS_DIR, f'test_{nb_stocks}stock.npz'))['paths']
+
+
 def load_model_for_game(game_id):
     """
     Lazy load a specific game's model and test paths.
     Uses a cache to keep at most MAX_CACHED_MODELS in memory.
     """
     # If already loaded in cache, return
-    if game_id in LOADED_MODELS_CACHE:
-        print(f"Using cached model for {game_id}")
-        return LOADED_MODELS_CACHE[game_id]
-
+    with MODEL_LOAD_LOCK:
+        if game_id in LOADED_MODELS_CACHE:
+            print(f"Using cached model for {game_id}")
+            # Mark as most recently used so eviction drops the least recently used
+            LOADED_MODELS_CACHE.move_to_end(game_id)
+            return LOADED_MODELS_CACHE[game_id]
+        # Requests are served by several threads: load (and evict) one model at a time
+        return _load_model_for_game(game_id)
+
+
+def _load_model_for_game(game_id):
+    """Load a game's model into LOADED_MODELS_CACHE (caller holds MODEL_LOAD_LOCK)."""
     print(f"Loading model for {game_id}...")
 
     # Get config for this game
@@ -188,49 +240,185 @@ def load_model_for_game(game_id):
     test_paths = None
 
     try:
-        test_data = np.load(os.path.join(PATHS_DIR, f'test_{nb_stocks}stock.npz'))
-        test_paths = test_data['paths']
-        print(f"  ✓ Loaded test paths for {nb_stocks} stock(s)")
+        if nb_stocks in PATHS_CACHE:
+            test_paths = PATHS_CACHE[nb_stocks]
+            print(f"  ✓ Using cached test paths for {nb_stocks} stock(s)")
+        else:
+            test_paths = PATHS_CACHE[nb_stocks] = load_test_paths(nb_stocks)
+            print(f"  ✓ Loaded test paths for {nb_stocks} stock(s)")
     except Exception as e:
         print(f"  ✗ Failed to load test paths: {e}")
         raise
 
     # Load trained model
     try:
-        model_file = os.path.join(MODELS_DIR, f"{game_id}.pkl")
-        with open(model_file, 'rb') as f:
-            model_data = pickle.load(f)
+        # Prefer the typed .json/.npz export; fall back to the legacy pickle
+        base_path = os.path.join(MODELS_DIR, game_id)
+        if os.path.exists(f"{base_path}.json") and os.path.exists(f"{base_path}.npz"):
+            model_data = load_model_npz(base_path)
+        else:
+            with open(f"{base_path}.pkl", 'rb') as f:
+                model_data = pickle.load(f)
         print(f"  ✓ Loaded model for {game_id}")
     except Exception as e:
         print(f"  ✗ Failed to load model: {e}")
         raise
 
-    # Cache management: remove oldest if cache is full
+    # Cache management: remove the least recently used model if cache is full
     if len(LOADED_MODELS_CACHE) >= MAX_CACHED_MODELS:
-        oldest_key = next(iter(LOADED_MODELS_CACHE))
+        oldest_key = LOADED_MODELS_CACHE.popitem(last=False)[0]
+        GAME_DATA[oldest_key]['loaded'] = False
         print(f"  Cache full, removing {oldest_key}")
-        del LOADED_MODELS_CACHE[oldest_key]
+        # The entry is left intact: requests in other threads may still be
+        # reading it, and the last of them drops the final reference. Once it
+        # is unreachable, collect it before the next model is built
+        release_memory()
 
     # Store in cache (support both 'rt' and 'srlsm' keys for backwards compatibility)
     rt_model = model_data.get('rt', model_data.get('srlsm'))
+    payoff = model_data['payoff']
+
+    # The test paths are fixed, so run the policy and the payoffs over all of
+    # them once; each request then only indexes into these arrays
+    exercise_dates = rt_model.predict_exercise_decisions(test_paths)
+    payoffs_timeline = payoff.eval_timeline(test_paths)
+    print(f"  ✓ Precomputed decisions and payoffs for {len(test_paths)} paths")
+
     model_cache = {
         'rt': rt_model,
         'model': model_data['model'],
-        'payoff': model_data['payoff'],
-        'test_paths': test_paths,
+        'payoff': payoff,
+        'nb_stocks': nb_stocks,
+        'exercise_dates': exercise_dates,
+        'payoffs_timeline': payoffs_timeline,
         'price': model_data['price'],
         'avg_exercise_time': model_data['avg_exercise_time']
     }
 
+    model_cache['responses'] = build_start_responses(game_id, model_cache)
+    # Serve paths in a shuffled cycle: every path comes up once before any repeats
+    model_cache['path_order'] = PATH_RNG.permutation(len(model_cache['responses']))
+    model_cache['path_counter'] = itertools.count()
+    print(f"  ✓ Serialized {len(model_cache['responses'])} game responses")
+
     LOADED_MODELS_CACHE[game_id] = model_cache
     GAME_DATA[game_id]['loaded'] = True
 
     return model_cache
 
 
+# glibc malloc_trim, looked up on first eviction (False when unavailable)
+_malloc_trim = None
+
+
+def release_memory():
+    """
+    Collect garbage and return freed heap pages to the OS.
+
+    Without malloc_trim, glibc keeps freed arenas mapped, so RSS stays at the
+    high-water mark of the largest model ever loaded. No-op for the trim on
+    platforms without glibc.
+    """
+    global _malloc_trim
+    gc.collect()
+    if _malloc_trim is None:
+        _malloc_trim = False
+        libc_name = ctypes.util.find_library('c')
+        try:
+            _malloc_trim = ctypes.CDLL(libc_name).malloc_trim if libc_name else False
+        except (OSError, AttributeError):
+            pass
+    if _malloc_trim:
+        _malloc_trim(0)
+
+
+def _orjson_default(obj):
+    """Fallback for values orjson cannot serialize natively (e.g. non-contiguous arrays)."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def get_barrier_paths(game_id, nb_dates):
+    """
+    Moving-barrier display paths for a game, computed once per (game_id, nb_dates).
+
+    Returns:
+        dict with 'barrier_path_upper' and/or 'barrier_path_lower' lists
+        (empty for games without moving barriers)
+    """
+    key = (game_id, nb_dates)
+    if key not in BARRIER_CACHE:
+        barrier_paths = {}
+        specs = MOVING_BARRIER_SPECS.get(game_id)
+        if specs is not None:
+            rng = np.random.RandomState(42)
+            for name, initial_barrier, low, high in specs:
+                barrier_paths[name] = generate_barrier_path(rng, initial_barrier, low, high, nb_dates)
+        BARRIER_CACHE[key] = barrier_paths
+    return BARRIER_CACHE[key]
+
+
+def generate_barrier_path(rng, initial_barrier, low, high, nb_dates):
+    """
+    Random-walk barrier for display: B(0) = initial_barrier, B(t+1) = B(t) + uniform(low, high).
+
+    Args:
+        rng: np.random.RandomState to draw the nb_dates steps from
+        initial_barrier: Barrier level at t=0
+        low, high: Step bounds
+        nb_dates: Number of steps
+
+    Returns:
+        list[float] of length nb_dates+1
+    """
+    steps = np.empty(nb_dates + 1)
+    steps[0] = initial_barrier
+    steps[1:] = rng.uniform(low, high, size=nb_dates)
+    # cumsum accumulates left to right, matching the step-by-step recurrence
+    return np.cumsum(steps).tolist()
+
+
 @app.route('/api/game/info', methods=['GET'])
 def get_game_info():
     """Get information about available games."""
+    global INFO_CACHE
+    # Snapshot the loaded-model fields under the lock, so another thread's
+    # eviction cannot remove an entry while the payload is being built
+    with MODEL_LOAD_LOCK:
+        loaded = {
+            key: {
+                'model': entry['model'],
+                'price': entry['price'],
+                'avg_exercise_time': entry['avg_exercise_time'],
+            }
+            for key, entry in LOADED_MODELS_CACHE.items()
+        }
+
+    # The payload only changes when the set of loaded models changes, so it is
+    # serialized once per set and served with an ETag for conditional requests.
+    # INFO_CACHE is replaced in one assignment so readers never see a mixed entry
+    info = INFO_CACHE
+    cache_key = tuple(sorted(loaded))
+    if info['key'] != cache_key:
+        body = orjson.dumps(build_game_info(loaded), option=orjson.OPT_SORT_KEYS)
+        info = INFO_CACHE = {'key': cache_key, 'body': body, 'etag': hashlib.sha1(body).hexdigest()}
+
+    response = app.response_class(info['body'], mimetype='application/json')
+    response.set_etag(info['etag'])
+    # Loaded-model details change as games are played, so always revalidate
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+def build_game_info(loaded):
+    """
+    Build the /api/game/info payload from GAME_DATA and the loaded models.
+
+    Args:
+        loaded: {game_id: {'model', 'price', 'avg_exercise_time'}} snapshot of
+            LOADED_MODELS_CACHE, taken under MODEL_LOAD_LOCK
+    """
     games = {}
     for key, data in GAME_DATA.items():
         games[key] = {
@@ -250,14 +438,14 @@ def get_game_info():
             games[key]['barrier_up'] = data['barrier_up']
 
         # If model is loaded in cache, include additional details
-        if key in LOADED_MODELS_CACHE:
-            model_cache = LOADED_MODELS_CACHE[key]
+        if key in loaded:
+            model_cache = loaded[key]
             games[key]['maturity'] = model_cache['model'].maturity
             games[key]['nb_dates'] = model_cache['model'].nb_dates
             games[key]['price'] = float(model_cache['price'])
             games[key]['avg_exercise_time'] = float(model_cache['avg_exercise_time'])
 
-    return jsonify(games)
+    return games
 
 
 @app.route('/api/game/start', methods=['GET'])
@@ -267,12 +455,13 @@ def start_game():
 
     Query params:
         product: game ID (e.g., 'upandoutcall', 'downandoutbskput', etc.)
+        batch: optional number of games k (1..MAX_BATCH_GAMES); when given,
+            returns {'games': [...]} with k games on random paths
 
     Returns:
         {
             'game_id': str,
             'path': list[list[float]],  # [nb_stocks][nb_dates+1]
-            'machine_decisions': list[bool],  # Exercise decision at each date
             'machine_exercise_date': int,
             'payoffs_timeline': list[float],  # Payoff at each date
             'game_info': {...}
@@ -283,80 +472,63 @@ def start_game():
     if product not in GAME_DATA:
         return jsonify({'error': f'Invalid product: {product}. Available: {list(GAME_DATA.keys())}'}), 400
 
+    batch = request.args.get('batch', type=int)
+    if 'batch' in request.args and (batch is None or not 1 <= batch <= MAX_BATCH_GAMES):
+        return jsonify({'error': f'batch must be an integer between 1 and {MAX_BATCH_GAMES}'}), 400
+
     # Lazy load the model for this game
     try:
         model_cache = load_model_for_game(product)
     except Exception as e:
         return jsonify({'error': f'Failed to load game model: {str(e)}'}), 500
 
-    # Get metadata
-    game_metadata = GAME_DATA[product]
+    # Select a random test path; its response body was serialized at model load
+    responses = model_cache['responses']
+    if batch is None:
+        path_idx = next_path_index(model_cache)
+        return app.response_class(responses[path_idx], mimetype='application/json')
 
-    # Select a random test path
-    test_paths = model_cache['test_paths']
-    path_idx = random.randint(0, len(test_paths) - 1)
-    selected_path = test_paths[path_idx:path_idx+1]  # Shape: (1, nb_stocks, nb_dates+1)
+    # Several games at once: join the stored bodies into one JSON document
+    bodies = [responses[next_path_index(model_cache)] for _ in range(batch)]
+    return app.response_class(b'{"games":[' + b','.join(bodies) + b']}',
+                              mimetype='application/json')
 
-    # Predict machine exercise decision
-    rt = model_cache['rt']
-    payoff = model_cache['payoff']
+
+def next_path_index(model_cache):
+    """
+    Next test path index from the game's shuffled cycle.
+
+    next() on itertools.count is atomic under the GIL, so threads never
+    take a lock or hand out the same position twice.
+    """
+    path_order = model_cache['path_order']
+    return int(path_order[next(model_cache['path_counter']) % len(path_order)])
+
+
+def build_start_responses(product, model_cache):
+    """
+    Serialize the /api/game/start body for every test path of a game.
+
+    Models and test paths are fixed, so each response is a deterministic
+    function of (product, path_idx) and can be built once at model load.
+
+    Returns:
+        list[bytes], indexed by path_idx
+    """
+    # Get metadata
+    game_metadata = GAME_DATA[product]
+    test_paths = PATHS_CACHE[model_cache['nb_stocks']]
     model = model_cache['model']
+    nb_dates = test_paths.shape[2] - 1
 
-    exercise_dates = rt.predict_exercise_decisions(selected_path)
-    machine_exercise_date = int(exercise_dates[0])
-
-    # Compute payoffs at each timestep
-    nb_dates = selected_path.shape[2] - 1
-    payoffs_timeline = []
-    machine_decisions = []
-
-    for t in range(nb_dates + 1):
-        path_up_to_t = selected_path[:, :, :t+1]
-        payoff_t = payoff.eval(path_up_to_t)[0]
-        payoffs_timeline.append(float(payoff_t))
-
-        # Machine exercises if this is the exercise date
-        machine_decisions.append(t == machine_exercise_date)
-
-    # Generate barrier paths for moving barrier games
-    barrier_path = None
-    barrier_path_upper = None
-    barrier_path_lower = None
-
-    if product == 'randomlymovingbarriercall':
-        # StepBarrierCall: single upper barrier
-        import numpy as np
-        rng = np.random.RandomState(42)
-        barrier_steps = rng.uniform(-2, 1, size=nb_dates)
-        barrier_path_upper = [125]  # Initial barrier
-        for step in barrier_steps:
-            barrier_path_upper.append(barrier_path_upper[-1] + step)
-    elif product == 'doublemovingbarrierdispersioncall':
-        # DoubleStepBarrierDispersionCall: double moving barriers
-        import numpy as np
-        rng = np.random.RandomState(42)
-
-        # Lower barrier
-        lower_steps = rng.uniform(-1, 2, size=nb_dates)
-        barrier_path_lower = [85]  # Initial barrier
-        for step in lower_steps:
-            barrier_path_lower.append(barrier_path_lower[-1] + step)
-
-        # Upper barrier
-        upper_steps = rng.uniform(-2, 1, size=nb_dates)
-        barrier_path_upper = [115]  # Initial barrier
-        for step in upper_steps:
-            barrier_path_upper.append(barrier_path_upper[-1] + step)
-
-    # Convert path to list format for JSON
-    # Shape: (nb_stocks, nb_dates+1)
-    path_list = selected_path[0].tolist()
+    # Barrier paths for moving barrier games (deterministic, cached)
+    barrier_paths = get_barrier_paths(product, nb_dates)
 
     # Get strike from payoff object (different for dispersion call: K=1)
     payoff = model_cache['payoff']
     strike = getattr(payoff, 'strike', 100)
 
-    # Game metadata
+    # Game metadata (identical for every path)
     game_info = {
         'name': game_metadata['name'],
         'description': game_metadata['description'],
@@ -377,22 +549,28 @@ def start_game():
     if 'barrier_type' in game_metadata:
         game_info['barrier_type'] = game_metadata['barrier_type']
 
-    response = {
-        'game_id': f"{product}_{path_idx}",
-        'path': path_list,
-        'machine_decisions': machine_decisions,
-        'machine_exercise_date': machine_exercise_date,
-        'payoffs_timeline': payoffs_timeline,
-        'game_info': game_info
-    }
+    exercise_dates = model_cache['exercise_dates']
+
+    responses = []
+    for path_idx in range(len(test_paths)):
+        # Machine exercise decision and payoffs, precomputed at model load
+        machine_exercise_date = int(exercise_dates[path_idx])
+
+        response = {
+            'game_id': f"{product}_{path_idx}",
+            # Path serialized directly from the array, shape (nb_stocks, nb_dates+1)
+            'path': np.ascontiguousarray(test_paths[path_idx]),
+            'machine_exercise_date': machine_exercise_date,
+            'payoffs_timeline': model_cache['payoffs_timeline'][path_idx],
+            'game_info': game_info
+        }
 
-    # Add barrier paths if they exist (for moving barrier games)
-    if barrier_path_upper is not None:
-        response['barrier_path_upper'] = barrier_path_upper
-    if barrier_path_lower is not None:
-        response['barrier_path_lower'] = barrier_path_lower
+        # Add barrier paths if they exist (for moving barrier games)
+        response.update(barrier_paths)
 
-    return jsonify(response)
+        responses.append(orjson.dumps(response, default=_orjson_default,
+                                      option=orjson.OPT_SERIALIZE_NUMPY))
+    return responses
 
 
 @app.route('/', methods=['GET'])
@@ -434,7 +612,7 @@ def keepalive():
     """
     return jsonify({
         'status': 'alive',
-        'timestamp': int(np.datetime64('now').astype('int64') / 1e9),
+        'timestamp': time.time_ns() // 10**9,
         'cached_game': list(LOADED_MODELS_CACHE.keys())[0] if LOADED_MODELS_CACHE else None
     })
 
@@ -461,4 +639,6 @@ if __name__ == '__main__':
     print(f"\nAvailable games: {list(GAME_DATA.keys())}")
     print("\n")
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; deployments run gunicorn (see render.yaml).
+    # Set FLASK_DEBUG=1 for the reloader and debugger.
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
@@ -61,13 +61,7 @@ def fix_model_file(model_path):
         return
 
     # Remove training artifacts
-    removed = []
-    if hasattr(rt, '_exercise_dates'):
-        delattr(rt, '_exercise_dates')
-        removed.append('_exercise_dates')
-    if hasattr(rt, 'split'):
-        delattr(rt, 'split')
-        removed.append('split')
+    removed = rt.strip_training_state()
 
     if not removed:
         print(f"  ✓ Already clean (no artifacts found)")
@@ -75,7 +69,7 @@ def fix_model_file(model_path):
 
     # Re-save the cleaned model
     with open(model_path, 'wb') as f:
-        pickle.dump(model_data, f)
+        pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     size_after = get_file_size_mb(model_path)
     reduction_pct = ((size_before - size_after) / size_before) * 100
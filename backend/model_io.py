@@ -0,0 +1,154 @@
+"""
+Typed on-disk format for trained game models (replaces pickle for serving).
+
+Each game is stored as two files in trained_models/:
+- {game_id}.json: class names and scalar attributes of the model, payoff and RT
+- {game_id}.npz:  every array (payoff weights, reservoir weights, coefficients)
+
+Loading never executes pickled code: classes are resolved from an explicit
+whitelist of backend modules and their attributes are set from plain data.
+
+Run this file to convert existing .pkl models:
+    python backend/model_io.py
+"""
+
+import sys
+import os
+import json
+import pickle
+import importlib
+
+import numpy as np
+
+# Add parent directory to path for backend module imports
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from backend.algorithms.rt import RT
+
+# Data paths
+DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
+MODELS_DIR = os.path.join(DATA_DIR, 'trained_models')
+
+FORMAT_VERSION = 1
+
+# Only classes from these modules can be rebuilt from a .json file
+ALLOWED_MODULES = ('backend.models.', 'backend.payoffs.')
+
+
+def _json_value(value):
+    """Convert NumPy scalars to plain Python values for json.dump."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    return value
+
+
+def _object_to_state(obj, prefix, arrays):
+    """Split obj.__dict__ into JSON attributes and arrays (stored under prefix.name)."""
+    attrs = {}
+    for name, value in vars(obj).items():
+        if isinstance(value, np.ndarray):
+            arrays[f'{prefix}.{name}'] = value
+        else:
+            attrs[name] = _json_value(value)
+    return {
+        'class': f'{type(obj).__module__}:{type(obj).__qualname__}',
+        'attrs': attrs,
+    }
+
+
+def _resolve_class(qualified_name):
+    """Import a 'module:Class' name, refusing modules outside ALLOWED_MODULES."""
+    module_name, class_name = qualified_name.split(':')
+    if not module_name.startswith(ALLOWED_MODULES):
+        raise ValueError(f"Refusing to load class from module {module_name}")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _object_from_state(state, prefix, arrays):
+    """Rebuild an object written by _object_to_state without calling __init__."""
+    cls = _resolve_class(state['class'])
+    obj = cls.__new__(cls)
+    obj.__dict__.update(state['attrs'])
+    array_prefix = f'{prefix}.'
+    for key in arrays:
+        if key.startswith(array_prefix):
+            setattr(obj, key[len(array_prefix):], arrays[key])
+    return obj
+
+
+def save_model_npz(model_data, base_path):
+    """
+    Write a trained model dict ('rt', 'model', 'payoff', 'price', 'avg_exercise_time')
+    to base_path.json and base_path.npz.
+    """
+    rt = model_data['rt']
+    arrays = {}
+    rt_config, rt_arrays = rt.to_inference_state()
+    arrays.update({f'rt.{key}': value for key, value in rt_arrays.items()})
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'price': float(model_data['price']),
+        'avg_exercise_time': float(model_data['avg_exercise_time']),
+        'model': _object_to_state(model_data['model'], 'model', arrays),
+        'payoff': _object_to_state(model_data['payoff'], 'payoff', arrays),
+        'rt': rt_config,
+    }
+
+    with open(f'{base_path}.json', 'w') as f:
+        json.dump(meta, f, indent=2)
+    np.savez(f'{base_path}.npz', **arrays)
+
+
+def load_model_npz(base_path):
+    """
+    Load a model written by save_model_npz.
+
+    Returns:
+        Dict with the same keys the API reads from the pickled models
+        ('rt', 'model', 'payoff', 'price', 'avg_exercise_time').
+    """
+    with open(f'{base_path}.json') as f:
+        meta = json.load(f)
+    if meta.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version: {meta.get('format_version')}")
+
+    with np.load(f'{base_path}.npz', allow_pickle=False) as npz:
+        arrays = {key: npz[key] for key in npz.files}
+
+    model = _object_from_state(meta['model'], 'model', arrays)
+    payoff = _object_from_state(meta['payoff'], 'payoff', arrays)
+    rt_arrays = {key[len('rt.'):]: value for key, value in arrays.items() if key.startswith('rt.')}
+    rt = RT.from_inference_state(model, payoff, meta['rt'], rt_arrays)
+
+    return {
+        'rt': rt,
+        'model': model,
+        'payoff': payoff,
+        'price': meta['price'],
+        'avg_exercise_time': meta['avg_exercise_time'],
+    }
+
+
+def main():
+    """Convert every .pkl model in the trained_models directory to .json + .npz."""
+    model_files = sorted(f for f in os.listdir(MODELS_DIR) if f.endswith('.pkl'))
+    if not model_files:
+        print("No .pkl files found!")
+        return
+
+    for filename in model_files:
+        with open(os.path.join(MODELS_DIR, filename), 'rb') as f:
+            model_data = pickle.load(f)
+        base_path = os.path.join(MODELS_DIR, filename[:-len('.pkl')])
+        save_model_npz(model_data, base_path)
+        print(f"  ✓ {filename} -> {os.path.basename(base_path)}.json/.npz")
+
+
+if __name__ == '__main__':
+    main()
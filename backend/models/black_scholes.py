@@ -5,6 +5,34 @@ Black-Scholes model for generating stock price paths.
 import math
 import numpy as np
 
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to the NumPy passes below
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _gbm_paths_inplace(paths, spot, drift_dt, vol_sqrt_dt):
+        """
+        Turn standard normals paths[:, :, 1:] into GBM prices in one pass per path.
+
+        Fuses scaling, cumulative sum, exp and the spot multiply that the
+        NumPy version does as separate passes over the whole array.
+        """
+        nb_paths, nb_stocks, nb_times = paths.shape
+        for p in prange(nb_paths):
+            for s in range(nb_stocks):
+                log_return = 0.0
+                paths[p, s, 0] = spot
+                for t in range(1, nb_times):
+                    log_return += drift_dt + vol_sqrt_dt * paths[p, s, t]
+                    paths[p, s, t] = spot * math.exp(log_return)
+else:
+    _gbm_paths_inplace = None
+
+# Paths per float64 block in the NumPy fallback of generate_paths
+FALLBACK_BLOCK_PATHS = 65536
+
 
 class BlackScholes:
     """
@@ -42,6 +70,10 @@ class BlackScholes:
         self.df = math.exp(-self.rate * self.dt)
         self.return_var = False
 
+        # Per-step GBM constants: log-drift and volatility scaling of a standard normal
+        self._drift_dt = (self.drift - 0.5 * self.volatility**2) * self.dt
+        self._vol_sqrt_dt = self.volatility * math.sqrt(self.dt)
+
     def disc_factor(self, date_begin, date_end):
         """Compute discount factor between two dates."""
         time = (date_end - date_begin) * self.dt
@@ -57,32 +89,40 @@ class BlackScholes:
             seed: Random seed for reproducibility
 
         Returns:
-            tuple: (stock_paths, None) where stock_paths has shape
+            tuple: (stock_paths, None) where stock_paths is float32 with shape
                    (nb_paths, nb_stocks, nb_dates+1)
         """
-        if seed is not None:
-            np.random.seed(seed)
+        rng = np.random.default_rng(seed)
 
         nb_paths = nb_paths or self.nb_paths
         nb_dates = nb_dates or self.nb_dates
 
-        # Initialize paths array
-        spot_paths = np.empty((nb_paths, self.nb_stocks, nb_dates + 1))
-        spot_paths[:, :, 0] = self.spot
+        # One float32 buffer holds the standard normals, then S_t (float32 like
+        # RoughHeston paths, for memory efficiency). Column 0 is a zero increment,
+        # so it ends up as S_0 * exp(0) = S_0
+        spot_paths = rng.standard_normal((nb_paths, self.nb_stocks, nb_dates + 1), dtype=np.float32)
 
-        # Generate Brownian increments
-        dW = np.random.normal(0, np.sqrt(self.dt),
-                              (nb_paths, self.nb_stocks, nb_dates))
+        if _gbm_paths_inplace is not None:
+            _gbm_paths_inplace(spot_paths, float(self.spot), self._drift_dt, self._vol_sqrt_dt)
+            return spot_paths, None
 
-        # Vectorized GBM path generation
+        # Vectorized GBM path generation, in place
         # S_t = S_0 * exp((r - q - 0.5*sigma^2)*t + sigma*W_t)
-        drift_term = (self.drift - 0.5 * self.volatility**2) * self.dt
-        diffusion_term = self.volatility * dW
-
-        # Cumulative sum to get log(S_t / S_0)
-        log_returns = np.cumsum(drift_term + diffusion_term, axis=2)
-
-        # Apply exponential to get stock prices
-        spot_paths[:, :, 1:] = self.spot * np.exp(log_returns)
+        # The log-path is accumulated in float64, like the numba kernel, one block
+        # of paths at a time so the float64 temporary stays small
+        for start in range(0, nb_paths, FALLBACK_BLOCK_PATHS):
+            block = spot_paths[start:start + FALLBACK_BLOCK_PATHS]
+            log_paths = block.astype(np.float64)
+            log_paths[:, :, 0] = 0
+            log_paths *= self._vol_sqrt_dt
+            log_paths[:, :, 1:] += self._drift_dt
+
+            # Cumulative sum to get log(S_t / S_0)
+            np.cumsum(log_paths, axis=2, out=log_paths)
+
+            # Apply exponential to get stock prices
+            np.exp(log_paths, out=log_paths)
+            log_paths *= self.spot
+            block[:] = log_paths
 
         return spot_paths, None
@@ -4,9 +4,84 @@ Variance follows a fractional process with Hurst parameter H < 0.5.
 """
 
 import math
+import functools
 import numpy as np
 import scipy.special as scispe
 
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to get_frac_var step by step
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _frac_var_paths_inplace(var_path, dZ, times_la, times_vol, thet, dt, gamma_h, block):
+        """
+        Fill var_path[1:] with the fractional variance recursion of get_frac_var.
+
+        Paths are independent, so blocks of paths run in parallel; within a
+        block the inner loop runs over contiguous paths. Each term and the
+        sequential sum over past steps are evaluated in the same order and
+        precision as get_frac_var, so the results are identical.
+
+        Args:
+            var_path: (nb_steps+1, n) float32, row 0 holds the initial variance
+            dZ: (nb_steps, n) float32 variance BM increments
+            times_la, times_vol: (nb_steps+1, nb_steps) kernel rows times lambda / vol
+            thet: long-run variance
+            dt: time step
+            gamma_h: gamma(H + 0.5)
+            block: number of paths per parallel block
+        """
+        nb_steps = var_path.shape[0] - 1
+        n = var_path.shape[1]
+        thet32 = np.float32(thet)
+        for b in prange((n + block - 1) // block):
+            start = b * block
+            width = min(block, n - start)
+            # thet - v_j and sqrt(v_j) of every past step, as in get_frac_var
+            mean_gap = np.empty((nb_steps, width), dtype=np.float32)
+            sqrt_var = np.empty((nb_steps, width), dtype=np.float32)
+            int1 = np.empty(width)
+            int2 = np.empty(width)
+            for k in range(1, nb_steps + 1):
+                for q in range(width):
+                    v = var_path[k - 1, start + q]
+                    mean_gap[k - 1, q] = thet32 - v
+                    sqrt_var[k - 1, q] = np.sqrt(v)
+                    int1[q] = 0.0
+                    int2[q] = 0.0
+                for j in range(k):
+                    t_la = times_la[k, j]
+                    t_vol = times_vol[k, j]
+                    for q in range(width):
+                        int1[q] += t_la * mean_gap[j, q] * dt
+                        int2[q] += t_vol * sqrt_var[j, q] * dZ[j, start + q]
+                for q in range(width):
+                    v = var_path[0, start + q] + (int1[q] + int2[q]) / gamma_h
+                    var_path[k, start + q] = max(v, 0.0)
+else:
+    _frac_var_paths_inplace = None
+
+
+@functools.lru_cache(maxsize=8)
+def _frac_kernel(dt, hurst, nb_steps):
+    """
+    Fractional kernel weights of every step and the gamma(H + 0.5) normalization.
+
+    Cached because they only depend on (dt, H, nb_steps), not on the paths.
+
+    Returns:
+        (table, gamma_h): table is a read-only (nb_steps+1, nb_steps) float64
+        array whose row k holds the k weights (t_k - t_j)^(H-0.5), j < k
+        (zero-padded)
+    """
+    table = np.zeros((nb_steps + 1, nb_steps))
+    for step in range(1, nb_steps + 1):
+        table[step, :step] = (dt * step - np.linspace(0, dt * (step - 1), step)) ** (hurst - 0.5)
+    table.flags.writeable = False
+    return table, scispe.gamma(hurst + 0.5)
+
 
 class RoughHeston:
     """
@@ -88,20 +163,19 @@ class RoughHeston:
             Next value of fractional var process
         """
         v0 = vars[0]
-        times = (self.dt * step - np.linspace(0, self.dt * (step - 1), step)) ** \
-                (self.H - 0.5)
+        table, gamma_h = _frac_kernel(self.dt, self.H, vars.shape[0] - 1)
+        times = table[step, :step]
         if len(vars.shape) == 2:
-            times = np.repeat(np.expand_dims(times, 1), vars.shape[1], axis=1)
+            times = times[:, None]  # Broadcast over paths without copying
         int1 = np.sum(times * la * (thet - vars[:step]) * self.dt, axis=0)
         int2 = np.sum(times * vol * np.sqrt(vars[:step]) * dZ[:step], axis=0)
-        v = v0 + (int1 + int2) / scispe.gamma(self.H + 0.5)
+        v = v0 + (int1 + int2) / gamma_h
         return np.maximum(v, 0)
 
     def _generate_paths(self, mu, la, thet, vol, start_X, nb_steps, v0=None,
                        nb_stocks=1, seed=None):
         """Generate multiple paths simultaneously (vectorized over stocks)"""
-        if seed is not None:
-            np.random.seed(seed)
+        rng = np.random.default_rng(seed)
 
         # Use float32 for memory efficiency
         spot_path = np.empty((nb_steps + 1, nb_stocks), dtype=np.float32)
@@ -115,19 +189,36 @@ class RoughHeston:
         log_spot_drift = lambda v, t: (mu - 0.5 * np.maximum(v, 0))
         log_spot_diffusion = lambda v: np.sqrt(np.maximum(v, 0))
 
-        # Generate random numbers as float32
-        normal_numbers_1 = np.random.normal(0, 1, (nb_steps, nb_stocks)).astype(np.float32)
-        normal_numbers_2 = np.random.normal(0, 1, (nb_steps, nb_stocks)).astype(np.float32)
-        dW = normal_numbers_1 * np.sqrt(self.dt)
-        dZ = (self.correlation * normal_numbers_1 + np.sqrt(
-            1 - self.correlation ** 2) * normal_numbers_2) * np.sqrt(self.dt)
+        def step_spot(k):
+            # S_k = S_{k-1} * exp(increment): no log round-trip, exp written straight into row k
+            increment = (log_spot_drift(var_path[k - 1], (k - 1) * self.dt) * self.dt
+                         + log_spot_diffusion(var_path[k - 1]) * dW[k - 1])
+            np.exp(increment, out=spot_path[k])
+            spot_path[k] *= spot_path[k - 1]
+
+        # Draw the normals directly as float32 and scale them in place:
+        # dW = N1 * sqrt(dt), dZ = (rho * N1 + sqrt(1 - rho^2) * N2) * sqrt(dt)
+        #    = rho * dW + sqrt((1 - rho^2) * dt) * N2
+        dW = rng.standard_normal((nb_steps, nb_stocks), dtype=np.float32)
+        dZ = rng.standard_normal((nb_steps, nb_stocks), dtype=np.float32)
+        dW *= np.float32(math.sqrt(self.dt))
+        dZ *= np.float32(math.sqrt((1 - self.correlation ** 2) * self.dt))
+        # spot_path[1:] is free until the spot loop fills it, so it holds rho * dW
+        scaled_dW = np.multiply(dW, np.float32(self.correlation), out=spot_path[1:])
+        dZ += scaled_dW
+
+        if _frac_var_paths_inplace is not None:
+            # The variance never depends on the spot, so the whole O(nb_steps^2)
+            # fractional recursion runs in one compiled pass first
+            times, gamma_h = _frac_kernel(self.dt, self.H, nb_steps)
+            _frac_var_paths_inplace(var_path, dZ, times * la, times * vol, thet, self.dt,
+                                    gamma_h, 256)
+            for k in range(1, nb_steps + 1):
+                step_spot(k)
+            return spot_path, var_path
 
         for k in range(1, nb_steps + 1):
-            spot_path[k] = np.exp(
-                np.log(spot_path[k - 1])
-                + log_spot_drift(var_path[k - 1], (k - 1) * self.dt) * self.dt
-                + log_spot_diffusion(var_path[k - 1]) * dW[k - 1]
-            )
+            step_spot(k)
             var_path[k] = self.get_frac_var(var_path, dZ, k, la, thet, vol)
 
         return spot_path, var_path
@@ -157,18 +248,16 @@ class RoughHeston:
             seed=seed
         )
 
-        # Downsample to exercise dates only
-        spot_paths = spot_paths[0::self.nb_steps_mult]
-        var_paths = var_paths[0::self.nb_steps_mult]
-
-        # Reshape to (nb_dates+1, nb_paths, nb_stocks)
-        spot_paths = np.reshape(spot_paths,
-                                (nb_dates + 1, nb_paths, self.nb_stocks))
-        var_paths = np.reshape(var_paths,
-                               (nb_dates + 1, nb_paths, self.nb_stocks))
-
-        # Transpose to (nb_paths, nb_stocks, nb_dates+1)
-        spot_paths = np.transpose(spot_paths, axes=(1, 2, 0))
-        var_paths = np.transpose(var_paths, axes=(1, 2, 0))
+        # Downsample to exercise dates and copy into C-contiguous
+        # (nb_paths, nb_stocks, nb_dates+1) arrays: time is the fastest axis for
+        # the payoff scans, and the fine-grid arrays are released instead of
+        # being kept alive by strided views
+        shape = (nb_paths, self.nb_stocks, nb_dates + 1)
+        spot_out = np.empty(shape, dtype=np.float32)
+        var_out = np.empty(shape, dtype=np.float32)
+        spot_out[...] = spot_paths[0::self.nb_steps_mult].reshape(
+            nb_dates + 1, nb_paths, self.nb_stocks).transpose(1, 2, 0)
+        var_out[...] = var_paths[0::self.nb_steps_mult].reshape(
+            nb_dates + 1, nb_paths, self.nb_stocks).transpose(1, 2, 0)
 
-        return spot_paths, var_paths
+        return spot_out, var_out
@@ -3,6 +3,7 @@ Barrier option payoff functions.
 """
 
 import numpy as np
+from backend.payoffs.knockout import MIN_PUT, LOOKBACK_PUT, knockout_payoff
 
 
 class Payoff:
@@ -27,20 +28,30 @@ class Payoff:
             stock_paths: Array of shape (nb_paths, nb_stocks, nb_dates+1)
 
         Returns:
-            payoffs: Array of shape (nb_paths, nb_dates+1)
+            payoffs: float32 array of shape (nb_paths, nb_dates+1)
         """
-        nb_paths, nb_stocks, nb_dates = stock_paths.shape
-        payoffs = np.zeros((nb_paths, nb_dates), dtype=np.float32)
+        return self.eval_timeline(stock_paths).astype(np.float32, copy=False)
 
-        for date in range(nb_dates):
-            if self.is_path_dependent:
-                # Pass full history up to this date
-                payoffs[:, date] = self.eval(stock_paths[:, :, :date + 1])
-            else:
-                # Pass only current timestep
-                payoffs[:, date] = self.eval(stock_paths[:, :, date])
+    def eval_timeline(self, stock_paths):
+        """
+        Evaluate payoff at every date of the given paths.
 
-        return payoffs
+        Unlike __call__, the output keeps the dtype returned by eval().
+        This default calls eval() once per date; path-dependent subclasses
+        override it with running-extrema versions that evaluate all dates at once.
+
+        Args:
+            stock_paths: Array of shape (nb_paths, nb_stocks, nb_dates+1)
+
+        Returns:
+            payoffs: Array of shape (nb_paths, nb_dates+1)
+        """
+        nb_dates_plus_1 = stock_paths.shape[2]
+        if self.is_path_dependent:
+            columns = [self.eval(stock_paths[:, :, :date + 1]) for date in range(nb_dates_plus_1)]
+        else:
+            columns = [self.eval(stock_paths[:, :, date]) for date in range(nb_dates_plus_1)]
+        return np.stack(columns, axis=1)
 
     def eval(self, X):
         """
@@ -101,19 +112,24 @@ class UpAndOutMinPut(Payoff):
             return payoff * barrier_not_hit
 
         elif X.ndim == 3:
-            # Full path case
-            # Check if barrier was breached at any point
-            max_along_path = np.max(X, axis=(1, 2))
-            barrier_not_hit = max_along_path < self.barrier
-
-            # Terminal payoff on minimum
-            terminal_min = np.min(X[:, :, -1], axis=1)
-            payoff = np.maximum(0, self.strike - terminal_min)
-
-            return payoff * barrier_not_hit
+            # Full path case: put on the terminal minimum, knocked out once
+            # any price reaches the barrier
+            return knockout_payoff(X, MIN_PUT, self.strike, upper=self.barrier)
         else:
             raise ValueError(f"Invalid dimensions: {X.ndim}")
 
+    def eval_timeline(self, X):
+        """
+        Evaluate the payoff at every date using the running maximum.
+
+        Args:
+            X: Stock paths of shape (nb_paths, nb_stocks, nb_dates+1)
+
+        Returns:
+            Payoffs of shape (nb_paths, nb_dates+1)
+        """
+        return knockout_payoff(X, MIN_PUT, self.strike, upper=self.barrier, timeline=True)
+
 
 class DoubleKnockOutLookbackFloatingPut(Payoff):
     """
@@ -152,19 +168,18 @@ class DoubleKnockOutLookbackFloatingPut(Payoff):
         Returns:
             Payoffs of shape (nb_paths,)
         """
-        if X.ndim == 3:
+        if X.ndim == 3 and X.shape[1] == 1:
+            # Single stock: lookback put knocked out by either barrier
+            return knockout_payoff(X, LOOKBACK_PUT,
+                                   lower=self.barrier_down, upper=self.barrier_up)
+        elif X.ndim == 3:
             # Check if price stayed within barriers
             max_price = np.max(X, axis=(1, 2))
             min_price = np.min(X, axis=(1, 2))
             stays_in_range = (min_price > self.barrier_down) & (max_price < self.barrier_up)
 
-            # Lookback floating strike: sell at maximum, buy at terminal
-            if X.shape[1] > 1:
-                # Multiple stocks: use basket average at terminal
-                terminal_basket = np.mean(X[:, :, -1], axis=1)
-            else:
-                # Single stock
-                terminal_basket = X[:, 0, -1]
+            # Lookback floating strike: sell at maximum, buy at terminal basket average
+            terminal_basket = np.mean(X[:, :, -1], axis=1)
 
             payoff = np.maximum(0, max_price - terminal_basket)
 
@@ -182,3 +197,27 @@ class DoubleKnockOutLookbackFloatingPut(Payoff):
 
             payoff = np.maximum(0, max_price - terminal)
             return payoff * stays_in_range
+
+    def eval_timeline(self, X):
+        """
+        Evaluate the payoff at every date using running extrema.
+
+        Args:
+            X: Stock paths of shape (nb_paths, nb_stocks, nb_dates+1)
+
+        Returns:
+            Payoffs of shape (nb_paths, nb_dates+1)
+        """
+        if X.shape[1] == 1:
+            return knockout_payoff(X, LOOKBACK_PUT, lower=self.barrier_down,
+                                   upper=self.barrier_up, timeline=True)
+
+        max_price = np.maximum.accumulate(np.max(X, axis=1), axis=1)
+        min_price = np.minimum.accumulate(np.min(X, axis=1), axis=1)
+        stays_in_range = (min_price > self.barrier_down) & (max_price < self.barrier_up)
+
+        # Average over a contiguous stock axis so the summation order matches eval()
+        terminal_basket = np.mean(np.ascontiguousarray(X.transpose(0, 2, 1)), axis=2)
+
+        payoff = np.maximum(0, max_price - terminal_basket)
+        return payoff * stays_in_range
@@ -9,8 +9,86 @@ Key principles:
 - For moving barriers, check S(τ) vs B(τ) at each specific time τ
 """
 
+import functools
+
 import numpy as np
 from backend.payoffs.barrier_options import Payoff
+from backend.payoffs.knockout import (
+    MIN_PUT, MAX_CALL, RANK3_CALL, LOOKBACK_PUT, knockout_payoff, path_extrema
+)
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to NumPy reductions
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _barrier_breached_kernel(prices, lower, upper):
+        """Per path, whether prices[p, tau] <= lower[tau] or >= upper[tau] for some tau.
+
+        Stops scanning a path at its first breach.
+        """
+        nb_paths, nb_times = prices.shape
+        breached = np.zeros(nb_paths, dtype=np.bool_)
+        for p in prange(nb_paths):
+            for tau in range(nb_times):
+                v = prices[p, tau]
+                if v <= lower[tau] or v >= upper[tau]:
+                    breached[p] = True
+                    break
+        return breached
+else:
+    _barrier_breached_kernel = None
+
+
+@functools.lru_cache(maxsize=128)
+def _random_walk_barriers(seed, t, walks):
+    """Seeded random-walk barriers B(0..t), cached since they only depend on the arguments.
+
+    Args:
+        seed: seed of the RandomState stream
+        t: number of steps
+        walks: tuple of (initial, low, high); walk i draws its t uniform(low, high)
+            steps from the stream after walk i-1
+
+    Returns:
+        Tuple of read-only (t+1,) float32 arrays, B(tau) = B(tau-1) + step(tau)
+    """
+    rng = np.random.RandomState(seed)
+    paths = []
+    for initial, low, high in walks:
+        path = np.empty(t + 1, dtype=np.float32)
+        path[0] = initial
+        path[1:] = rng.uniform(low, high, size=t)
+        np.cumsum(path, out=path)  # Sequential float32 sum, same as adding step by step
+        path.flags.writeable = False
+        paths.append(path)
+    return tuple(paths)
+
+
+def _barrier_breached(prices, lower=None, upper=None):
+    """Whether each path of prices (nb_paths, t+1) ever touches a barrier, shape (nb_paths,).
+
+    Args:
+        prices: observed prices, one row per path
+        lower: (t+1,) lower barrier B_L(tau), breached when price <= B_L(tau); None for no lower
+        upper: (t+1,) upper barrier B_U(tau), breached when price >= B_U(tau); None for no upper
+    """
+    if _barrier_breached_kernel is not None:
+        nb_times = prices.shape[1]
+        if lower is None:
+            lower = np.full(nb_times, -np.inf, dtype=prices.dtype)
+        if upper is None:
+            upper = np.full(nb_times, np.inf, dtype=prices.dtype)
+        return _barrier_breached_kernel(prices, lower, upper)
+
+    breached = np.zeros(prices.shape[0], dtype=bool)
+    if upper is not None:
+        breached |= np.any(prices >= upper[np.newaxis, :], axis=1)
+    if lower is not None:
+        breached |= np.any(prices <= lower[np.newaxis, :], axis=1)
+    return breached
 
 
 # ============================================================================
@@ -38,18 +116,16 @@ class UpAndOutCall(Payoff):
         Args:
             X: shape (nb_paths, 1, t+1) - price path up to time t
         """
-        # Check if maximum price up to time t exceeds barrier
-        max_price_up_to_t = np.max(X[:, 0, :], axis=1)
-        knocked_out = max_price_up_to_t >= self.barrier
+        # Call on S(t), knocked out once the price reaches the barrier
+        return knockout_payoff(X, MAX_CALL, self.strike, upper=self.barrier)
 
-        # Payoff at time t
-        price_at_t = X[:, 0, -1]
-        payoff = np.maximum(0, price_at_t - self.strike)
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
-
-        return payoff
+        Args:
+            X: shape (nb_paths, 1, nb_dates+1) - full price path
+        """
+        return knockout_payoff(X, MAX_CALL, self.strike, upper=self.barrier, timeline=True)
 
 
 class DownAndOutMinPut(Payoff):
@@ -73,18 +149,16 @@ class DownAndOutMinPut(Payoff):
         Args:
             X: shape (nb_paths, nb_stocks, t+1)
         """
-        # Check if minimum price across all stocks and time goes below barrier
-        min_price_overall = np.min(X, axis=(1, 2))  # min over stocks and time
-        knocked_out = min_price_overall <= self.barrier
-
-        # Payoff: put on minimum at time t
-        min_at_t = np.min(X[:, :, -1], axis=1)
-        payoff = np.maximum(0, self.strike - min_at_t)
+        # Put on the minimum at time t, knocked out once any price reaches the barrier
+        return knockout_payoff(X, MIN_PUT, self.strike, lower=self.barrier)
 
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        return payoff
+        Args:
+            X: shape (nb_paths, nb_stocks, nb_dates+1)
+        """
+        return knockout_payoff(X, MIN_PUT, self.strike, lower=self.barrier, timeline=True)
 
 
 class DoubleBarrierMaxCall(Payoff):
@@ -109,20 +183,18 @@ class DoubleBarrierMaxCall(Payoff):
         Args:
             X: shape (nb_paths, nb_stocks, t+1)
         """
-        # Check barriers across all stocks and time
-        max_overall = np.max(X, axis=(1, 2))  # max over stocks and time
-        min_overall = np.min(X, axis=(1, 2))  # min over stocks and time
+        # Call on the maximum at time t, knocked out by either barrier
+        return knockout_payoff(X, MAX_CALL, self.strike,
+                               lower=self.barrier_down, upper=self.barrier_up)
 
-        knocked_out = (max_overall >= self.barrier_up) | (min_overall <= self.barrier_down)
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        # Payoff: max of all stocks at time t
-        max_at_t = np.max(X[:, :, -1], axis=1)
-        payoff = np.maximum(0, max_at_t - self.strike)
-
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
-
-        return payoff
+        Args:
+            X: shape (nb_paths, nb_stocks, nb_dates+1)
+        """
+        return knockout_payoff(X, MAX_CALL, self.strike,
+                               lower=self.barrier_down, upper=self.barrier_up, timeline=True)
 
 
 # ============================================================================
@@ -146,6 +218,12 @@ class StepBarrierCall(Payoff):
         self.initial_barrier = initial_barrier
         self.seed = seed
 
+    def _barrier_path(self, t):
+        """Barrier B_U(0..t), shape (t+1,) float32 (read-only, cached)."""
+        # Adds uniform(-2, 1) at each step
+        barrier_path, = _random_walk_barriers(self.seed, t, ((self.initial_barrier, -2, 1),))
+        return barrier_path
+
     def eval(self, X):
         """Evaluate payoff at time t.
 
@@ -156,20 +234,14 @@ class StepBarrierCall(Payoff):
         t = t_plus_1 - 1
 
         # Generate barrier path up to time t (deterministic based on seed)
-        rng = np.random.RandomState(self.seed)
-        barrier_steps = rng.uniform(-2, 1, size=t).astype(np.float32)
-        barrier_path = np.zeros(t_plus_1, dtype=np.float32)
-        barrier_path[0] = self.initial_barrier
-
-        for tau in range(1, t_plus_1):
-            barrier_path[tau] = barrier_path[tau-1] + barrier_steps[tau-1]
+        barrier_path = self._barrier_path(t)
 
         # Get stock prices
         prices = X[:, 0, :]  # (nb_paths, t+1)
 
         # Check if price ever exceeds the time-varying barrier
         # At each time τ, check if S(τ) >= B(τ)
-        knocked_out = np.any(prices >= barrier_path[np.newaxis, :], axis=1)
+        knocked_out = _barrier_breached(prices, upper=barrier_path)
 
         # Payoff at time t
         price_at_t = prices[:, -1]
@@ -180,6 +252,22 @@ class StepBarrierCall(Payoff):
 
         return payoff
 
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
+
+        The barrier steps are drawn sequentially from one seeded stream, so
+        the barrier up to t is a prefix of the barrier up to maturity.
+
+        Args:
+            X: shape (nb_paths, 1, nb_dates+1)
+        """
+        prices = X[:, 0, :]
+        barrier_path = self._barrier_path(prices.shape[1] - 1)
+        knocked_out = np.logical_or.accumulate(prices >= barrier_path[np.newaxis, :], axis=1)
+        payoff = np.maximum(0, prices - self.strike)
+        payoff[knocked_out] = 0
+        return payoff
+
 
 class GameUpAndOutMinPut(Payoff):
     """Up-and-out put on minimum of stocks.
@@ -202,18 +290,16 @@ class GameUpAndOutMinPut(Payoff):
         Args:
             X: shape (nb_paths, nb_stocks, t+1)
         """
-        # Check if maximum across all stocks and time goes above barrier
-        max_overall = np.max(X, axis=(1, 2))  # max over stocks and time
-        knocked_out = max_overall >= self.barrier
+        # Put on the minimum at time t, knocked out once any price reaches the barrier
+        return knockout_payoff(X, MIN_PUT, self.strike, upper=self.barrier)
 
-        # Payoff: put on minimum at time t
-        min_at_t = np.min(X[:, :, -1], axis=1)
-        payoff = np.maximum(0, self.strike - min_at_t)
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
-
-        return payoff
+        Args:
+            X: shape (nb_paths, nb_stocks, nb_dates+1)
+        """
+        return knockout_payoff(X, MIN_PUT, self.strike, upper=self.barrier, timeline=True)
 
 
 class DownAndOutBestOfKCall(Payoff):
@@ -240,13 +326,13 @@ class DownAndOutBestOfKCall(Payoff):
             X: shape (nb_paths, nb_stocks, t+1)
         """
         # Check if minimum across all stocks and time goes below barrier
-        min_overall = np.min(X, axis=(1, 2))  # min over stocks and time
+        _, min_overall = path_extrema(X)  # min over stocks and time
         knocked_out = min_overall <= self.barrier
 
         # Payoff: average of top k stocks at time t
         prices_at_t = X[:, :, -1]  # (nb_paths, nb_stocks)
-        sorted_prices = np.sort(prices_at_t, axis=1)[:, ::-1]  # Sort descending
-        top_k_avg = np.mean(sorted_prices[:, :self.k], axis=1)
+        top_k = np.partition(prices_at_t, -self.k, axis=1)[:, -self.k:]  # Top k, unordered
+        top_k_avg = np.mean(top_k, axis=1)
 
         payoff = np.maximum(0, top_k_avg - self.strike)
 
@@ -255,6 +341,19 @@ class DownAndOutBestOfKCall(Payoff):
 
         return payoff
 
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
+
+        Args:
+            X: shape (nb_paths, nb_stocks, nb_dates+1)
+        """
+        knocked_out = np.minimum.accumulate(np.min(X, axis=1), axis=1) <= self.barrier
+        top_k = np.partition(X, -self.k, axis=1)[:, -self.k:, :]  # Top k over stocks, unordered
+        top_k_avg = np.mean(top_k, axis=1)
+        payoff = np.maximum(0, top_k_avg - self.strike)
+        payoff[knocked_out] = 0
+        return payoff
+
 
 # ============================================================================
 # IMPOSSIBLE DIFFICULTY
@@ -283,22 +382,18 @@ class DoubleBarrierLookbackFloatingPut(Payoff):
         Args:
             X: shape (nb_paths, 1, t+1)
         """
-        prices = X[:, 0, :]  # (nb_paths, t+1)
+        # Lookback floating put max_{τ≤t} S(τ) - S(t), knocked out by either barrier
+        return knockout_payoff(X, LOOKBACK_PUT,
+                               lower=self.barrier_down, upper=self.barrier_up)
 
-        # Check double barrier
-        max_price = np.max(prices, axis=1)
-        min_price = np.min(prices, axis=1)
-        knocked_out = (max_price >= self.barrier_up) | (min_price <= self.barrier_down)
-
-        # Lookback floating put payoff at time t
-        max_up_to_t = np.max(prices, axis=1)
-        price_at_t = prices[:, -1]
-        payoff = np.maximum(0, max_up_to_t - price_at_t)
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
-
-        return payoff
+        Args:
+            X: shape (nb_paths, 1, nb_dates+1)
+        """
+        return knockout_payoff(X, LOOKBACK_PUT,
+                               lower=self.barrier_down, upper=self.barrier_up, timeline=True)
 
 
 class DoubleBarrierRankWeightedBasketCall(Payoff):
@@ -329,26 +424,19 @@ class DoubleBarrierRankWeightedBasketCall(Payoff):
         nb_paths, nb_stocks, t_plus_1 = X.shape
         assert nb_stocks == 3, "DoubleBarrierRankWeightedBasketCall requires exactly 3 stocks"
 
-        # Check double barrier across all stocks and time
-        max_overall = np.max(X, axis=(1, 2))
-        min_overall = np.min(X, axis=(1, 2))
-        knocked_out = (max_overall >= self.barrier_up) | (min_overall <= self.barrier_down)
-
-        # Calculate rank-weighted basket at time t
-        prices_at_t = X[:, :, -1]  # (nb_paths, 3)
-
-        # Sort prices in descending order (rank 1 = highest)
-        sorted_prices = np.sort(prices_at_t, axis=1)[:, ::-1]  # (nb_paths, 3)
+        # Rank-weighted basket at time t (1st=15%, 2nd=50%, 3rd=35%), knocked out by either barrier
+        return knockout_payoff(X, RANK3_CALL, self.strike, lower=self.barrier_down,
+                               upper=self.barrier_up, weights=self.weights)
 
-        # Apply weights: 1st=15%, 2nd=50%, 3rd=35%
-        weighted_basket = np.sum(sorted_prices * self.weights[np.newaxis, :], axis=1)
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
 
-        payoff = np.maximum(0, weighted_basket - self.strike)
-
-        # Zero out knocked-out paths
-        payoff[knocked_out] = 0
-
-        return payoff
+        Args:
+            X: shape (nb_paths, 3, nb_dates+1) - exactly 3 stocks required
+        """
+        assert X.shape[1] == 3, "DoubleBarrierRankWeightedBasketCall requires exactly 3 stocks"
+        return knockout_payoff(X, RANK3_CALL, self.strike, lower=self.barrier_down,
+                               upper=self.barrier_up, weights=self.weights, timeline=True)
 
 
 class DoubleStepBarrierDispersionCall(Payoff):
@@ -372,6 +460,17 @@ class DoubleStepBarrierDispersionCall(Payoff):
         self.barrier_down = barrier_down
         self.seed = seed
 
+    def _barrier_paths(self, t):
+        """Barriers (B_L(0..t), B_U(0..t)), each shape (t+1,) float32.
+
+        Both are drawn from one seeded stream (all lower steps first), so the
+        upper barrier depends on t and is not a prefix of a longer one.
+        Read-only and cached.
+        """
+        # Lower barrier adds uniform(-1, 2) at each step, upper adds uniform(-2, 1)
+        return _random_walk_barriers(
+            self.seed, t, ((self.barrier_down, -1, 2), (self.barrier_up, -2, 1)))
+
     def eval(self, X):
         """Evaluate payoff at time t.
 
@@ -382,32 +481,14 @@ class DoubleStepBarrierDispersionCall(Payoff):
         t = t_plus_1 - 1
 
         # Generate stochastic barrier paths up to time t
-        rng = np.random.RandomState(self.seed)
-
-        # Lower barrier: adds uniform(-1, 2) at each step
-        lower_steps = rng.uniform(-1, 2, size=t).astype(np.float32)
-        lower_barrier_path = np.zeros(t_plus_1, dtype=np.float32)
-        lower_barrier_path[0] = self.barrier_down
-
-        for tau in range(1, t_plus_1):
-            lower_barrier_path[tau] = lower_barrier_path[tau-1] + lower_steps[tau-1]
-
-        # Upper barrier: adds uniform(-2, 1) at each step
-        upper_steps = rng.uniform(-2, 1, size=t).astype(np.float32)
-        upper_barrier_path = np.zeros(t_plus_1, dtype=np.float32)
-        upper_barrier_path[0] = self.barrier_up
-
-        for tau in range(1, t_plus_1):
-            upper_barrier_path[tau] = upper_barrier_path[tau-1] + upper_steps[tau-1]
+        lower_barrier_path, upper_barrier_path = self._barrier_paths(t)
 
         # Calculate basket average at each time step
         basket_prices = np.mean(X, axis=1)  # (nb_paths, t+1)
 
         # Check if basket breaches either barrier at any time τ
         # At each τ, check if basket(τ) <= B_L(τ) or basket(τ) >= B_U(τ)
-        breaches_upper = np.any(basket_prices >= upper_barrier_path[np.newaxis, :], axis=1)
-        breaches_lower = np.any(basket_prices <= lower_barrier_path[np.newaxis, :], axis=1)
-        knocked_out = breaches_upper | breaches_lower
+        knocked_out = _barrier_breached(basket_prices, lower_barrier_path, upper_barrier_path)
 
         # Dispersion payoff at time t: std_dev(S_1(t), ..., S_d(t)) - K
         prices_at_t = X[:, :, -1]  # (nb_paths, nb_stocks)
@@ -422,3 +503,30 @@ class DoubleStepBarrierDispersionCall(Payoff):
         payoff[knocked_out] = 0
 
         return payoff
+
+    def eval_timeline(self, X):
+        """Evaluate payoff at every date t, shape (nb_paths, nb_dates+1).
+
+        The barriers used at date t depend on t, so they are laid out as
+        (nb_dates+1, nb_dates+1) matrices with row t holding B(0..t) and
+        the entries after t set so they can never breach.
+
+        Args:
+            X: shape (nb_paths, nb_stocks, nb_dates+1)
+        """
+        t_plus_1 = X.shape[2]
+        lower = np.full((t_plus_1, t_plus_1), -np.inf, dtype=np.float32)
+        upper = np.full((t_plus_1, t_plus_1), np.inf, dtype=np.float32)
+        for t in range(t_plus_1):
+            lower[t, :t + 1], upper[t, :t + 1] = self._barrier_paths(t)
+
+        # breaches[p, t] = any over tau <= t of basket(tau) outside (B_L_t(tau), B_U_t(tau))
+        basket_prices = np.mean(X, axis=1)[:, np.newaxis, :]  # (nb_paths, 1, nb_dates+1)
+        knocked_out = np.any((basket_prices >= upper) | (basket_prices <= lower), axis=2)
+
+        # Dispersion payoff at each t: std_dev across stocks - K
+        mean_price = np.mean(X, axis=1, keepdims=True)
+        std_dev = np.sqrt(np.mean((X - mean_price) ** 2, axis=1))
+        payoff = np.maximum(0, std_dev - self.strike)
+        payoff[knocked_out] = 0
+        return payoff
@@ -0,0 +1,172 @@
+"""
+Knock-out payoff kernels shared by the barrier and game payoffs.
+
+knockout_payoff evaluates a payoff on the prices at time t that is worth 0
+once any price has touched a barrier, either at the last date or at every
+date of the paths. With numba installed it walks each path once in a
+compiled loop; otherwise the same values come from NumPy reductions.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: fall back to NumPy reductions
+    njit = None
+
+# Payoff on the prices at time t used by knockout_payoff
+MIN_PUT = 0       # max(K - min_i S_i(t), 0)
+MAX_CALL = 1      # max(max_i S_i(t) - K, 0)
+RANK3_CALL = 2    # max(sum_r w_r * r-th largest S_i(t) - K, 0), exactly 3 stocks
+LOOKBACK_PUT = 3  # max(max_{τ≤t} S(τ) - S(t), 0), one stock
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _path_extrema_kernel(X):
+        """Max and min of each path over stocks and time in a single pass."""
+        nb_paths, nb_stocks, nb_times = X.shape
+        max_overall = np.empty(nb_paths, dtype=X.dtype)
+        min_overall = np.empty(nb_paths, dtype=X.dtype)
+        for p in prange(nb_paths):
+            hi = X[p, 0, 0]
+            lo = hi
+            for i in range(nb_stocks):
+                for j in range(nb_times):
+                    v = X[p, i, j]
+                    if v > hi:
+                        hi = v
+                    if v < lo:
+                        lo = v
+            max_overall[p] = hi
+            min_overall[p] = lo
+        return max_overall, min_overall
+
+    @njit(parallel=True, cache=True)
+    def _knockout_payoff_kernel(X, kind, strike, lower, upper, weights, out):
+        """Knock-out payoff of each path at the last out.shape[1] dates, written to out.
+
+        Walks each path once over time, tracking the running max/min over
+        stocks; a path is worth 0 from the first date any price is <= lower or
+        >= upper. Terms are evaluated in the same order and precision as the
+        NumPy code in knockout_payoff, so the results are identical.
+        """
+        nb_paths, nb_stocks, nb_times = X.shape
+        first_out = nb_times - out.shape[1]
+        for p in prange(nb_paths):
+            run_max = X[p, 0, 0]
+            for tau in range(nb_times):
+                hi = X[p, 0, tau]
+                lo = hi
+                for i in range(1, nb_stocks):
+                    v = X[p, i, tau]
+                    hi = max(hi, v)
+                    lo = min(lo, v)
+                if lo <= lower or hi >= upper:
+                    # Knocked out for this and every later date
+                    for j in range(max(tau - first_out, 0), out.shape[1]):
+                        out[p, j] = 0
+                    break
+                run_max = max(run_max, hi)
+                if tau < first_out:
+                    continue
+                if kind == MIN_PUT:
+                    value = strike - lo
+                elif kind == MAX_CALL:
+                    value = hi - strike
+                elif kind == RANK3_CALL:
+                    a = X[p, 0, tau]
+                    b = X[p, 1, tau]
+                    c = X[p, 2, tau]
+                    lo_ab = min(a, b)
+                    hi_ab = max(a, b)
+                    value = (max(hi_ab, c) * weights[0] + max(lo_ab, min(hi_ab, c)) * weights[1]
+                             + min(lo_ab, c) * weights[2] - strike)
+                else:
+                    value = run_max - X[p, 0, tau]
+                out[p, tau - first_out] = value if value > 0 else 0
+else:
+    _path_extrema_kernel = None
+    _knockout_payoff_kernel = None
+
+
+def path_extrema(X):
+    """Max and min over stocks and time of X (nb_paths, nb_stocks, t+1), each (nb_paths,).
+
+    Both come from one pass over X when numba is available; NumPy's
+    reductions over two small trailing axes are several times slower.
+    """
+    if _path_extrema_kernel is not None:
+        return _path_extrema_kernel(X)
+    return np.max(X, axis=(1, 2)), np.min(X, axis=(1, 2))
+
+
+def _rank3(a, b, c):
+    """Elementwise (largest, middle, smallest) of three arrays, without sorting."""
+    lo_ab = np.minimum(a, b)
+    hi_ab = np.maximum(a, b)
+    return (np.maximum(hi_ab, c),
+            np.maximum(lo_ab, np.minimum(hi_ab, c)),
+            np.minimum(lo_ab, c))
+
+
+def _as_operand(value, X):
+    """value cast to the dtype NumPy would use to combine it with array X."""
+    return np.asarray(value, dtype=np.result_type(X.dtype, value))[()]
+
+
+def knockout_payoff(X, kind, strike=None, lower=None, upper=None, weights=None, timeline=False):
+    """Payoff of kind (MIN_PUT, ...) that is 0 once min_{τ≤t,i} S_i(τ) <= lower
+    or max_{τ≤t,i} S_i(τ) >= upper.
+
+    Args:
+        X: shape (nb_paths, nb_stocks, t+1)
+        kind: payoff on the prices at time t, see MIN_PUT and the other kinds
+        strike: strike K (unused by LOOKBACK_PUT)
+        lower: lower barrier B_L, or None
+        upper: upper barrier B_U, or None
+        weights: (3,) rank weights for RANK3_CALL
+        timeline: evaluate at every date t, shape (nb_paths, t+1), instead of
+            at the last date only, shape (nb_paths,)
+    """
+    if _knockout_payoff_kernel is not None:
+        # Same result dtype and operand casts as the NumPy expressions below
+        dtype = np.result_type(X.dtype, *[v for v in (strike, weights) if v is not None])
+        out = np.empty((X.shape[0], X.shape[2] if timeline else 1), dtype=dtype)
+        _knockout_payoff_kernel(
+            X, kind,
+            dtype.type(0) if strike is None else np.asarray(strike, dtype=dtype)[()],
+            -np.inf if lower is None else _as_operand(lower, X),
+            np.inf if upper is None else _as_operand(upper, X),
+            np.empty(0) if weights is None else weights,
+            out)
+        return out if timeline else out[:, 0]
+
+    if timeline:
+        prices = X  # (nb_paths, nb_stocks, nb_dates+1)
+        hi, lo = np.max(X, axis=1), np.min(X, axis=1)
+        run_max = np.maximum.accumulate(hi, axis=1)
+        run_min = np.minimum.accumulate(lo, axis=1)
+    else:
+        prices = X[:, :, -1]  # (nb_paths, nb_stocks)
+        hi, lo = np.max(prices, axis=1), np.min(prices, axis=1)
+        run_max, run_min = path_extrema(X)  # max/min over stocks and time
+
+    knocked_out = np.zeros(run_max.shape, dtype=bool)
+    if lower is not None:
+        knocked_out |= run_min <= lower
+    if upper is not None:
+        knocked_out |= run_max >= upper
+
+    if kind == MIN_PUT:
+        payoff = np.maximum(0, strike - lo)
+    elif kind == MAX_CALL:
+        payoff = np.maximum(0, hi - strike)
+    elif kind == RANK3_CALL:
+        first, second, third = _rank3(prices[:, 0], prices[:, 1], prices[:, 2])
+        payoff = np.maximum(0, first * weights[0] + second * weights[1] + third * weights[2] - strike)
+    else:
+        payoff = np.maximum(0, run_max - prices[:, 0])
+
+    # Zero out knocked-out paths
+    payoff[knocked_out] = 0
+    return payoff
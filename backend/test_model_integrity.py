@@ -1,5 +1,9 @@
 """
 Test if cleaned models still have the necessary data for predictions.
+
+Models are inspected without rebuilding torch or backend objects: those
+classes are replaced by lightweight stubs while unpickling, so the check
+never imports torch or materializes the reservoir tensors.
 """
 
 import sys
@@ -11,12 +15,35 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from backend.algorithms.rt import RT
-from backend.models.rough_heston import RoughHeston
-from backend.payoffs.game_payoffs import *
-
 MODELS_DIR = os.path.join(SCRIPT_DIR, 'data', 'trained_models')
 
+# Modules whose classes are replaced by stubs instead of being imported
+STUB_MODULES = ('torch', 'backend')
+
+
+class _Stub:
+    """Placeholder for an unpickled object; keeps its attributes, nothing else."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple) and len(state) == 2:
+            state, slot_state = state
+            if slot_state:
+                self.__dict__.update(slot_state)
+        if isinstance(state, dict):
+            self.__dict__.update(state)
+
+
+class StubUnpickler(pickle.Unpickler):
+    """Unpickler that resolves torch/backend classes to empty _Stub subclasses."""
+
+    def find_class(self, module, name):
+        if module.split('.')[0] in STUB_MODULES:
+            return type(name, (_Stub,), {})
+        return super().find_class(module, name)
+
 def test_model(model_path):
     """Test if a model file has the required data."""
     filename = os.path.basename(model_path)
@@ -24,7 +51,7 @@ def test_model(model_path):
 
     try:
         with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
+            model_data = StubUnpickler(f).load()
 
         rt = model_data.get('rt')
         if rt is None:
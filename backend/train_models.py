@@ -6,7 +6,7 @@ This script:
    - 1-stock: 15M paths
    - 3-stock: 5M paths
    - 7-stock: 2M paths
-2. Trains RT models for all 9 games using shared paths
+2. Trains RT models for all 9 games using shared paths, in parallel processes
 3. Generates shared test paths (500) for each stock count
 4. Saves models and paths to disk
 
@@ -14,8 +14,11 @@ Run this BEFORE starting the API server.
 """
 
 import numpy as np
+import torch
 import pickle
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from backend.models.rough_heston import RoughHeston
 from backend.payoffs.game_payoffs import (
     # MEDIUM
@@ -32,6 +35,7 @@ from backend.payoffs.game_payoffs import (
     DoubleStepBarrierDispersionCall
 )
 from backend.algorithms.rt import RT
+from backend.model_io import save_model_npz
 
 
 # Game parameters - Rough Heston model
@@ -77,6 +81,16 @@ DATA_DIR = os.path.join(SCRIPT_DIR, 'data')
 PATHS_DIR = os.path.join(DATA_DIR, 'paths')
 MODELS_DIR = os.path.join(DATA_DIR, 'trained_models')
 
+# Games trained in parallel (one process each); set TRAIN_WORKERS=1 to train sequentially.
+# Unset or 0 sizes the pool from available memory (see _default_train_workers): each
+# worker holds its own per-path training arrays, several GB for the 15M-path games
+TRAIN_WORKERS = int(os.environ.get('TRAIN_WORKERS', 0))
+
+# Estimated peak worker memory per training path: float64 payoff timeline
+# (nb_dates+1 values), float32 regression state, and the reservoir hidden layer,
+# basis and least-squares copies on the in-the-money half of the paths
+WORKER_BYTES_PER_PATH = 512
+
 
 # Game configurations in order
 GAME_CONFIGS = [
@@ -158,6 +172,37 @@ GAME_CONFIGS = [
 ]
 
 
+# One Rough Heston model per stock count, shared by path generation and training
+_model_cache = {}
+
+
+def get_model(nb_stocks):
+    """Return the cached RoughHeston for nb_stocks, creating it on first use."""
+    if nb_stocks not in _model_cache:
+        _model_cache[nb_stocks] = RoughHeston(
+            drift=PARAMS['drift'],
+            volatility=PARAMS['volatility'],
+            mean=PARAMS['mean'],
+            speed=PARAMS['speed'],
+            correlation=PARAMS['correlation'],
+            hurst=PARAMS['hurst'],
+            spot=PARAMS['spot'],
+            nb_stocks=nb_stocks,
+            nb_paths=TRAIN_PATHS_CONFIG[nb_stocks],
+            nb_dates=PARAMS['nb_dates'],
+            maturity=PARAMS['maturity'],
+            dividend=PARAMS['dividend'],
+            v0=PARAMS['v0'],
+            nb_steps_mult=PARAMS['nb_steps_mult']
+        )
+    return _model_cache[nb_stocks]
+
+
+def train_paths_file(nb_stocks):
+    """Path of the .npy file holding the shared training paths for nb_stocks."""
+    return os.path.join(PATHS_DIR, f'train_{nb_stocks}stock.npy')
+
+
 def generate_shared_paths(nb_stocks, train_seed, test_seed):
     """Generate shared training and test paths for a given number of stocks."""
     nb_train_paths = TRAIN_PATHS_CONFIG[nb_stocks]
@@ -167,32 +212,23 @@ def generate_shared_paths(nb_stocks, train_seed, test_seed):
     print(f"Generating shared paths for {nb_stocks} stock(s)")
     print(f"{'='*60}")
 
-    # Create Rough Heston model for training paths
-    model = RoughHeston(
-        drift=PARAMS['drift'],
-        volatility=PARAMS['volatility'],
-        mean=PARAMS['mean'],
-        speed=PARAMS['speed'],
-        correlation=PARAMS['correlation'],
-        hurst=PARAMS['hurst'],
-        spot=PARAMS['spot'],
-        nb_stocks=nb_stocks,
-        nb_paths=nb_train_paths,
-        nb_dates=PARAMS['nb_dates'],
-        maturity=PARAMS['maturity'],
-        dividend=PARAMS['dividend'],
-        v0=PARAMS['v0'],
-        nb_steps_mult=PARAMS['nb_steps_mult']
-    )
+    # Rough Heston model for training paths
+    model = get_model(nb_stocks)
+    model.nb_paths = nb_train_paths
 
     # Generate training paths
     print(f"Generating {nb_train_paths:,} training paths...")
     train_paths, _ = model.generate_paths(seed=train_seed)
-    train_path_file = os.path.join(PATHS_DIR, f'train_{nb_stocks}stock.npz')
-    np.savez_compressed(train_path_file, paths=train_paths)
+    train_path_file = train_paths_file(nb_stocks)
+    np.save(train_path_file, train_paths.astype(np.float32, copy=False))
     print(f"Saved training paths to {train_path_file}")
     print(f"Shape: {train_paths.shape}")
 
+    # Train from a read-only memory map so the paths for every stock count
+    # are not all held in RAM while the games are trained
+    del train_paths
+    train_paths = np.load(train_path_file, mmap_mode='r')
+
     # Generate test paths
     print(f"Generating {nb_test_paths:,} test paths...")
     model.nb_paths = nb_test_paths
@@ -200,6 +236,11 @@ def generate_shared_paths(nb_stocks, train_seed, test_seed):
     test_path_file = os.path.join(PATHS_DIR, f'test_{nb_stocks}stock.npz')
     np.savez_compressed(test_path_file, paths=test_paths)
     print(f"Saved test paths to {test_path_file}")
+
+    # Uncompressed copy for the API, which memory-maps it
+    test_npy_file = os.path.join(PATHS_DIR, f'test_{nb_stocks}stock.npy')
+    np.save(test_npy_file, test_paths)
+    print(f"Saved test paths to {test_npy_file}")
     print(f"Shape: {test_paths.shape}")
 
     return train_paths, test_paths
@@ -214,23 +255,9 @@ def train_game(config, train_paths):
     nb_stocks = config['nb_stocks']
     nb_train_paths = TRAIN_PATHS_CONFIG[nb_stocks]
 
-    # Create Rough Heston model
-    model = RoughHeston(
-        drift=PARAMS['drift'],
-        volatility=PARAMS['volatility'],
-        mean=PARAMS['mean'],
-        speed=PARAMS['speed'],
-        correlation=PARAMS['correlation'],
-        hurst=PARAMS['hurst'],
-        spot=PARAMS['spot'],
-        nb_stocks=nb_stocks,
-        nb_paths=nb_train_paths,
-        nb_dates=PARAMS['nb_dates'],
-        maturity=PARAMS['maturity'],
-        dividend=PARAMS['dividend'],
-        v0=PARAMS['v0'],
-        nb_steps_mult=PARAMS['nb_steps_mult']
-    )
+    # Rough Heston model shared with path generation
+    model = get_model(nb_stocks)
+    model.nb_paths = nb_train_paths
 
     # Create payoff
     payoff = config['payoff_class'](**config['payoff_kwargs'])
@@ -249,8 +276,13 @@ def train_game(config, train_paths):
         dropout=PARAMS['dropout']
     )
 
+    # Evaluate the reservoir on the GPU when one is available
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    rt.reservoir.to(device)
     price, time_gen = rt.price(train_eval_split=2, stock_paths=train_paths)
     avg_exercise_time = rt.get_exercise_time()
+    # Saved models must load on CPU-only API servers
+    rt.reservoir.to('cpu')
 
     print(f"\nTraining complete!")
     print(f"  Option price: {price:.4f}")
@@ -258,27 +290,63 @@ def train_game(config, train_paths):
 
     # Clean training artifacts to reduce file size
     # These arrays are only needed during training, not for inference
-    if hasattr(rt, '_exercise_dates'):
-        delattr(rt, '_exercise_dates')
-    if hasattr(rt, 'split'):
-        delattr(rt, 'split')
+    rt.strip_training_state()
 
     # Save trained model
+    model_data = {
+        'rt': rt,
+        'model': model,
+        'payoff': payoff,
+        'price': price,
+        'avg_exercise_time': avg_exercise_time,
+        'config': config
+    }
     model_file = os.path.join(MODELS_DIR, f"{config['id']}.pkl")
     with open(model_file, 'wb') as f:
-        pickle.dump({
-            'rt': rt,
-            'model': model,
-            'payoff': payoff,
-            'price': price,
-            'avg_exercise_time': avg_exercise_time,
-            'config': config
-        }, f)
+        pickle.dump(model_data, f, protocol=pickle.HIGHEST_PROTOCOL)
     print(f"Saved trained model to {model_file}")
 
+    # Typed .json + .npz export, which the API loads in preference to the pickle
+    base_path = os.path.join(MODELS_DIR, config['id'])
+    save_model_npz(model_data, base_path)
+    print(f"Saved inference export to {base_path}.json/.npz")
+
     return rt
 
 
+def _default_train_workers():
+    """
+    Number of training processes that fit in currently available memory.
+
+    The training paths are memory-mapped and shared between workers, but every
+    worker materializes its own per-path arrays for the game it trains
+    (WORKER_BYTES_PER_PATH each), so the largest path set bounds the pool size.
+    Falls back to 1 (sequential) where available memory cannot be queried.
+    """
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return 1
+    per_worker = max(TRAIN_PATHS_CONFIG.values()) * WORKER_BYTES_PER_PATH
+    return max(1, min(os.cpu_count() or 1, available // per_worker))
+
+
+def _train_game_worker(config, seed, nb_threads):
+    """
+    Train one game in a pool worker.
+
+    The worker memory-maps the shared training paths itself (so the arrays
+    are never pickled) and seeds torch, which draws the reservoir weights,
+    so each model does not depend on which worker picked it up.
+    """
+    torch.set_num_threads(nb_threads)
+    torch.manual_seed(seed)
+
+    train_paths = np.load(train_paths_file(config['nb_stocks']), mmap_mode='r')
+    train_game(config, train_paths)
+    return config['id']
+
+
 def main():
     """Main training script."""
     print("\n" + "="*60)
@@ -320,10 +388,24 @@ def main():
     print("Training all games...")
     print(f"{'='*60}")
 
+    # Submit games grouped by stock count so workers sharing a paths file run together
+    workers = min(TRAIN_WORKERS or _default_train_workers(), len(GAME_CONFIGS))
+    print(f"Training with {workers} worker process(es)")
+    nb_threads = max(1, (os.cpu_count() or 1) // workers)
+    seeds = {config['id']: i for i, config in enumerate(GAME_CONFIGS)}
+    groups = {}
     for config in GAME_CONFIGS:
-        nb_stocks = config['nb_stocks']
-        train_paths = shared_paths[nb_stocks]['train']
-        train_game(config, train_paths)
+        groups.setdefault(config['nb_stocks'], []).append(config)
+
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(_train_game_worker, config, seeds[config['id']], nb_threads)
+            for nb_stocks in sorted(groups)
+            for config in groups[nb_stocks]
+        ]
+        for future in futures:
+            future.result()
 
     print("\n" + "="*60)
     print("All 9 models trained successfully!")
@@ -18,6 +18,14 @@ except Exception as e:
     print(f"   ✗ Import error: {e}")
     sys.exit(1)
 
+# Compile (or load from numba's on-disk cache) the payoff kernels once up front,
+# so the numeric tests below never include JIT compilation time
+_warm_paths = np.full((2, 3, 3), 100.0, dtype=np.float32)
+UpAndOutMinPut(strike=100, barrier=110).eval(_warm_paths)
+UpAndOutMinPut(strike=100, barrier=110).eval(_warm_paths[:, :, :2])  # Date slices, as in pricing
+DoubleKnockOutLookbackFloatingPut(strike=100, barrier_down=90, barrier_up=110).eval(
+    np.ascontiguousarray(_warm_paths[:, :1, :]))
+
 # Test 2: Black-Scholes path generation
 print("\n2. Testing Black-Scholes path generation...")
 try:
@@ -4,6 +4,12 @@ Verify that the project structure is correct (doesn't require dependencies).
 
 import os
 import sys
+import argparse
+
+parser = argparse.ArgumentParser(description="Verify the project structure.")
+parser.add_argument('--fast-fail', action='store_true',
+                    help="stop at the first missing file or directory (for CI)")
+args = parser.parse_args()
 
 print("Verifying project structure...\n")
 
@@ -47,23 +53,47 @@ required_dirs = [
     'frontend/src/styles'
 ]
 
+# Directory listings, one os.scandir per parent instead of a stat per checked path
+_listings = {}
+
+
+def _entry(path):
+    """Return the os.DirEntry for path, or None if it does not exist."""
+    parent, name = os.path.split(path)
+    if parent not in _listings:
+        try:
+            with os.scandir(parent or '.') as it:
+                _listings[parent] = {entry.name: entry for entry in it}
+        except OSError:
+            _listings[parent] = {}
+    return _listings[parent].get(name)
+
+
 all_ok = True
 
 print("Checking directories...")
 for directory in required_dirs:
-    if os.path.isdir(directory):
+    entry = _entry(directory)
+    if entry is not None and entry.is_dir():
         print(f"  ✓ {directory}")
     else:
         print(f"  ✗ {directory} - MISSING")
         all_ok = False
+        if args.fast_fail:
+            break
 
 print("\nChecking files...")
 for file_path in required_files:
-    if os.path.isfile(file_path):
+    if args.fast_fail and not all_ok:
+        break
+    entry = _entry(file_path)
+    if entry is not None and entry.is_file():
         print(f"  ✓ {file_path}")
     else:
         print(f"  ✗ {file_path} - MISSING")
         all_ok = False
+        if args.fast_fail:
+            break
 
 print("\n" + "="*60)
 if all_ok: